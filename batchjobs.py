@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+"""
+Run a batch of GIF, scene and circuit sweep jobs described in JSON lines
+
+    python batchjobs.py jobs.jsonl [--workers 4] [--cache media/batch]
+
+One job per line, recognized by its "kind"; other lines are skipped:
+
+    {"kind": "convgif", "x": "u(t + 1) - u(t - 1)", "h": "exp(-t)*u(t)",
+     "t": [-4, 6, 2000], "ti": -3, "tf": 5, "output": "gifs/rect.gif",
+     "options": {"fram": 100, "plotConv": true, "ylabel": ["h", "x", "y"]}}
+    {"kind": "gif", "x": "cos(t)", "y": "sin(2*t)", "t": [0, 6.3, 1000],
+     "output": "gifs/lissajous.gif", "options": {"fram": 100}}
+    {"kind": "scene", "file": "main.py", "scene": "Convolution", "quality": "l",
+     "output": "videos/convolution_l.mp4"}
+    {"kind": "sweep", "circuit": "RLCser", "t": [0, 5, 500], "output": "sweeps/rlc.npz",
+     "params": {"vC_t0": 0, "iL_t0": 0, "vC_inf": 5, "t0": 0, "L": 1,
+                "R": {"linspace": [0.5, 3, 100]}, "C": [0.1, 0.5, 1]}, "grid": true}
+
+Expressions are sympy strings in t, with u = Heaviside; "t" is the
+[start, stop, samples] of a linspace. Jobs are identified by a hash of
+their content (everything but "output"), the source of the sinais package
+and, for scenes, the source of the scene file and of the local modules it
+imports (see sourcehash): identical jobs are built once and copied to
+each output. Every build goes to <cache>/objects/<hash> and is logged in
+<cache>/progress.jsonl as soon as it finishes, so an interrupted batch
+resumes where it stopped and already built outputs are only copied.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import sys
+import time
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from pathlib import Path
+
+from sourcehash import filesHash, sourceHash
+
+JOB_KINDS = ("convgif", "gif", "scene", "sweep")
+
+# saídas de cada função vetorizada de sinais.circuits
+SWEEP_OUTPUTS = {
+    "RL": ("responseRL_vec", ["iL", "vL", "tau"]),
+    "RC": ("responseRC_vec", ["vC", "iC", "tau"]),
+    "RLCpar": ("responseRLCpar_vec", ["alpha", "omega0", "iL", "vC", "resp"]),
+    "RLCser": ("responseRLCser_vec", ["alpha", "omega0", "iL", "vC", "resp"]),
+}
+
+
+def readJobs(path):
+    """
+    Jobs of a JSON lines file, skipping lines without a known "kind"
+
+    :return: jobs [list of dicts] and number of skipped lines [int]
+    """
+    jobs = []
+    skipped = 0
+    with open(path, encoding="utf-8") as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                spec = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"{path}:{lineno}: invalid JSON ({e}), skipped", file=sys.stderr)
+                skipped += 1
+                continue
+            if not isinstance(spec, dict) or spec.get("kind") not in JOB_KINDS:
+                skipped += 1
+                continue
+            if "output" not in spec:
+                print(f"{path}:{lineno}: {spec['kind']} job without output, skipped", file=sys.stderr)
+                skipped += 1
+                continue
+            spec["line"] = lineno
+            jobs.append(spec)
+    return jobs, skipped
+
+
+@lru_cache(maxsize=None)
+def sinaisHash():
+    """
+    Hash of every module of the sinais package, which all job kinds run
+    """
+    package = Path(__file__).resolve().parent / "sinais"
+    return filesHash(sorted(package.rglob("*.py")), package.parent)
+
+
+def jobHash(spec):
+    """
+    Hash of what a job builds: the spec without output or line number,
+    the extension of the output, the source of the sinais package and, for
+    scenes, the source of the scene file and of every local module it imports
+    """
+    content = {key: value for key, value in spec.items() if key not in ("output", "line")}
+    content["suffix"] = Path(spec["output"]).suffix.lower()
+    content["sinais"] = sinaisHash()
+    if spec["kind"] == "scene":
+        content["source"] = sourceHash(spec["file"])
+
+    text = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:20]
+
+
+def _timeGrid(spec):
+    import numpy as np
+
+    start, stop, samples = spec["t"]
+    return np.linspace(start, stop, int(samples))
+
+
+def _symbolic(text, t):
+    import sympy as sp
+
+    return sp.sympify(text, locals={"t": t, "u": sp.Heaviside})
+
+
+def _sweepValue(value):
+    import numpy as np
+
+    if isinstance(value, dict):
+        (name, args), = value.items()
+        return getattr(np, name)(*args)
+    return np.asarray(value, dtype=float)
+
+
+def _buildConvGIF(spec, target):
+    import sympy as sp
+
+    from sinais.convolution import genConvGIF
+
+    t = sp.symbols("t", real=True)
+    options = dict(spec.get("options", {}))
+    if "figsize" in options:
+        options["figsize"] = tuple(options["figsize"])
+    genConvGIF(
+        _symbolic(spec["x"], t), _symbolic(spec["h"], t), t, _timeGrid(spec),
+        spec["ti"], spec["tf"], str(target), **options,
+    )
+
+
+def _buildGIF(spec, target):
+    import sympy as sp
+
+    from sinais.lambdacache import cachedLambdify
+    from sinais.render import genGIF
+
+    t = sp.symbols("t", real=True)
+    tt = _timeGrid(spec)
+    x = cachedLambdify(t, _symbolic(spec["x"], t))(tt) + 0 * tt
+    y = cachedLambdify(t, _symbolic(spec["y"], t))(tt) + 0 * tt
+    genGIF(x, y, str(target), **spec.get("options", {}))
+
+
+def _buildScene(spec, target, media_dir, key):
+    from renderfarm import RenderJob, _render
+
+    job = RenderJob(spec["file"], spec["scene"], spec.get("quality", "l"), media_dir=media_dir)
+    # textos por job, como nos shards do renderfarm; só o cache de Tex é compartilhado
+    config = dict(job.config, text_dir=str(Path(media_dir) / "batch_texts" / key))
+    _render({"file": job.file, "scene": job.scene, "config": config})
+    shutil.copyfile(job.outputPath(), target)
+
+
+def _buildSweep(spec, target):
+    import numpy as np
+
+    import sinais.circuits
+
+    name, outputs = SWEEP_OUTPUTS[spec["circuit"]]
+    params = {key: _sweepValue(value) for key, value in spec["params"].items()}
+    if spec.get("grid"):
+        # produto cartesiano dos parâmetros, um conjunto por linha
+        values = np.meshgrid(*params.values(), indexing="ij")
+    else:
+        values = np.broadcast_arrays(*params.values())
+    params = {key: np.ravel(value) for key, value in zip(params, values)}
+
+    t = _timeGrid(spec)
+    result = getattr(sinais.circuits, name)(t=t, **params)
+    arrays = dict(zip(outputs, result))
+    arrays.update({f"param_{key}": value for key, value in params.items()})
+    np.savez_compressed(target, t=t, **arrays)
+
+
+def _runJob(spec, key, objects, media_dir):
+    """
+    Worker: build one job into the objects folder
+
+    The output is written under a temporary name and renamed at the end, so
+    an interrupted job never leaves a file that looks finished.
+
+    :return: entry of the progress log [dict]
+    """
+    suffix = Path(spec["output"]).suffix
+    target = Path(objects) / f"{key}{suffix}"
+    partial = Path(objects) / f"{key}.part{suffix}"
+    start = time.perf_counter()
+    entry = {"hash": key, "kind": spec["kind"], "line": spec["line"]}
+
+    try:
+        if spec["kind"] == "convgif":
+            _buildConvGIF(spec, partial)
+        elif spec["kind"] == "gif":
+            _buildGIF(spec, partial)
+        elif spec["kind"] == "scene":
+            _buildScene(spec, partial, media_dir, key)
+        else:
+            # np.savez acrescenta .npz a nomes sem essa extensão
+            partial = partial.with_suffix(".npz")
+            _buildSweep(spec, partial)
+        os.replace(partial, target)
+        entry.update(status="ok", object=target.name)
+    except Exception as e:
+        entry.update(status="error", error=f"{type(e).__name__}: {e}", traceback=traceback.format_exc())
+    finally:
+        if partial.exists():
+            partial.unlink()
+
+    entry["elapsed"] = time.perf_counter() - start
+    return entry
+
+
+class Progress:
+    """
+    Append-only log of finished jobs, <cache>/progress.jsonl
+
+    The last entry of each hash wins, so failed jobs are retried on the
+    next run and a rebuilt job replaces its old entry.
+    """
+
+    def __init__(self, cache):
+        self.cache = Path(cache)
+        self.objects = self.cache / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.path = self.cache / "progress.jsonl"
+        self.entries = {}
+
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # linha cortada por uma interrupção
+                    self.entries[entry["hash"]] = entry
+
+    def built(self, key):
+        """
+        Object file of a job built before, None if it has to be built
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry["status"] != "ok":
+            return None
+        path = self.objects / entry["object"]
+        return path if path.exists() else None
+
+    def record(self, entry):
+        self.entries[entry["hash"]] = entry
+        line = {key: value for key, value in entry.items() if key != "traceback"}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def _publish(obj, outputs):
+    """
+    Copy a built object to every output that is missing or differs
+    """
+    size = obj.stat().st_size
+    for output in outputs:
+        output = Path(output)
+        if output.exists() and output.stat().st_size == size and output.stat().st_mtime >= obj.stat().st_mtime:
+            continue
+        output.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(obj, output)
+
+
+def runBatch(path, workers=None, cache="media/batch", media_dir="media", force=False, dry_run=False, log=print):
+    """
+    Build every job of a JSON lines file that is not built yet
+
+    :param path: JSON lines file [string]
+    :param workers: number of processes (None uses every core) [int]
+    :param cache: folder of the objects and the progress log [string]
+    :param media_dir: manim media folder of the scene jobs [string]
+    :param force: rebuild jobs found in the progress log [bool]
+    :param dry_run: only report what would be built [bool]
+
+    :return: counts of jobs, unique jobs, cached, built and failed [dict]
+    """
+    jobs, skipped = readJobs(path)
+    groups = {}
+    for spec in jobs:
+        groups.setdefault(jobHash(spec), []).append(spec)
+
+    progress = Progress(cache)
+    todo = []
+    counts = {"lines skipped": skipped, "jobs": len(jobs), "unique": len(groups), "cached": 0, "built": 0, "failed": 0}
+    for key, specs in groups.items():
+        obj = None if force else progress.built(key)
+        if obj is None:
+            todo.append(key)
+        else:
+            counts["cached"] += 1
+            if not dry_run:
+                _publish(obj, [spec["output"] for spec in specs])
+
+    log(f"{len(jobs)} jobs ({len(groups)} unique), {counts['cached']} already built, {len(todo)} to build")
+    if dry_run:
+        for key in todo:
+            spec = groups[key][0]
+            log(f"  {key}  line {spec['line']:4d}  {spec['kind']:8s} -> {spec['output']}")
+        return counts
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    todo = deque(todo)
+    with ProcessPoolExecutor(workers) as pool:
+        pending = {}
+        try:
+            while todo or pending:
+                # no máximo dois jobs por worker na fila do pool
+                while todo and len(pending) < 2 * workers:
+                    key = todo.popleft()
+                    future = pool.submit(_runJob, groups[key][0], key, str(progress.objects), media_dir)
+                    pending[future] = key
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key = pending.pop(future)
+                    entry = future.result()
+                    progress.record(entry)
+                    spec = groups[key][0]
+                    if entry["status"] == "ok":
+                        _publish(progress.objects / entry["object"], [s["output"] for s in groups[key]])
+                        counts["built"] += 1
+                        log(f"ok     {entry['elapsed']:7.1f}s  line {spec['line']:4d}  {spec['kind']:8s} -> {spec['output']}")
+                    else:
+                        counts["failed"] += 1
+                        log(f"FAILED {entry['elapsed']:7.1f}s  line {spec['line']:4d}  {spec['kind']:8s}  {entry['error']}")
+        except KeyboardInterrupt:
+            # o que já terminou está no log: a próxima execução continua daqui
+            for future in pending:
+                future.cancel()
+            log(f"interrupted, {len(todo) + len(pending)} jobs left")
+            raise
+
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("jobs", help="JSON lines file with the jobs")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--cache", default=os.path.join("media", "batch"), help="objects and progress log folder")
+    parser.add_argument("--media_dir", default="media", help="manim media folder of the scene jobs")
+    parser.add_argument("--force", action="store_true", help="rebuild jobs already in the progress log")
+    parser.add_argument("--dry-run", action="store_true", help="only list the jobs that would be built")
+    args = parser.parse_args(argv)
+
+    try:
+        counts = runBatch(args.jobs, args.workers, args.cache, args.media_dir, args.force, args.dry_run)
+    except KeyboardInterrupt:
+        return 130
+    print(", ".join(f"{value} {name}" for name, value in counts.items()))
+    return 1 if counts["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+"""
+Time fixed workloads of the convolution, plotting and circuit hot paths
+
+    python benchmark.py                          # every workload
+    python benchmark.py --only "conv/*" "rlc/*"  # a subset
+    python benchmark.py --save-baseline          # store as the new baseline
+
+Results go to benchmarks/<date>_<commit>.json with the machine metadata.
+If benchmarks/baseline.json exists (or --baseline is given) each workload
+is compared with it and the exit code is 1 when any of them got slower than
+the threshold allows. Workloads whose dependencies are missing (manim for
+the scene) are recorded as skipped, and so are the GIF workloads above
+PILLOW_MAX_FRAMES without ffmpeg: the pillow writer keeps every frame in
+memory (several GB for 1000 frames at 200 dpi).
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent / "benchmarks"
+
+GIF_FRAMES = [50, 200, 1000]
+# o PillowWriter guarda todos os quadros na memória (~7 MB cada a 200 dpi)
+PILLOW_MAX_FRAMES = 200
+CONV_SIZES = [10**3, 10**4, 10**5, 10**6]
+# a convolução direta é O(N²): só até 1e4 amostras
+DIRECT_MAX = 10**4
+RLC_SETS = [1, 100, 10**4]
+RLC_SYMBOLIC_SETS = [1, 10]
+
+
+# cada workload é uma função que prepara os dados e devolve (params, run)
+# ou (params, run, cleanup): só run() é cronometrada
+
+
+class Skipped(Exception):
+    """
+    A workload that can't run on this machine
+    """
+
+
+def gifWorkload(frames, writer):
+    import numpy as np
+    import sympy as sp
+
+    from sinais.convolution import genConvGIF
+
+    if writer != "ffmpeg" and frames > PILLOW_MAX_FRAMES:
+        raise Skipped(f"{frames} frames need ffmpeg, {writer} holds them all in memory")
+
+    t = sp.symbols("t", real=True)
+    x = sp.Heaviside(t + 1) - sp.Heaviside(t - 1)
+    h = sp.exp(-t) * sp.Heaviside(t)
+    totalTime = np.linspace(-4, 6, 2000)
+    folder = tempfile.TemporaryDirectory(prefix="sinais_bench_")
+    figName = os.path.join(folder.name, "conv.mp4" if writer == "ffmpeg" else "conv.gif")
+
+    def run():
+        genConvGIF(
+            x, h, t, totalTime, totalTime[0] - 1, totalTime[-1] + 1, figName,
+            ylabel=["h(τ)", "x(t-τ)", "y(t)"], fram=frames, plotConv=True, writer=writer,
+        )
+
+    return {"frames": frames, "samples": len(totalTime), "writer": writer}, run, folder.cleanup
+
+
+def convWorkload(samples, method):
+    import numpy as np
+
+    from sinais import convTime
+
+    rng = np.random.default_rng(0)
+    totalTime = np.linspace(-5, 5, samples)
+    h_num = rng.standard_normal(samples)
+    x_num = rng.standard_normal(samples)
+
+    def run():
+        convTime(h_num, x_num, totalTime, "same", method)
+
+    return {"samples": samples, "method": method}, run
+
+
+def rlcVecWorkload(sets):
+    import numpy as np
+
+    from sinais.circuits import responseRLCser_vec
+
+    rng = np.random.default_rng(0)
+    R = rng.uniform(0.5, 3, sets)
+    C = rng.uniform(0.1, 1, sets)
+    t = np.linspace(0, 5, 500)
+
+    def run():
+        responseRLCser_vec(1.0, 0.0, 5.0, 0.0, R, 1.0, C, t)
+
+    return {"sets": sets, "samples": len(t)}, run
+
+
+def rlcNumWorkload(sets, method):
+    import numpy as np
+
+    from sinais.circuits import responseRLCser_num
+
+    rng = np.random.default_rng(0)
+    R = rng.uniform(0.5, 3, sets)
+    C = rng.uniform(0.1, 1, sets)
+    t = np.linspace(0, 5, 500)
+    Vs = 5 * np.ones(t.shape)
+
+    def run():
+        for R_k, C_k in zip(R, C):
+            responseRLCser_num(R_k, 1.0, C_k, 1.0, 0.0, Vs, t, method)
+
+    return {"sets": sets, "samples": len(t), "method": method}, run
+
+
+def rlcSymbolicWorkload(sets):
+    import numpy as np
+
+    from sinais.circuits import responseRLCser
+
+    rng = np.random.default_rng(0)
+    R = rng.uniform(0.5, 3, sets)
+    C = rng.uniform(0.1, 1, sets)
+
+    def run():
+        for R_k, C_k in zip(R, C):
+            responseRLCser(1.0, 0.0, 5.0, 0.0, float(R_k), 1.0, float(C_k))
+
+    return {"sets": sets}, run
+
+
+def sceneWorkload(scene):
+    from manim import tempconfig
+
+    import main
+
+    scene_cls = getattr(main, scene)
+    folder = tempfile.TemporaryDirectory(prefix="sinais_bench_")
+    cfg = {
+        "dry_run": True,
+        "media_dir": folder.name,
+        "input_file": os.path.abspath(main.__file__),
+        "progress_bar": "none",
+        "preview": False,
+    }
+
+    def run():
+        # sem quadros nem vídeo: só o construct() e as animações
+        with tempconfig(cfg):
+            scene_cls().render()
+
+    return {"scene": scene, "mode": "construct-only"}, run, folder.cleanup
+
+
+def workloads(writer):
+    """
+    Every benchmark of the suite, by name
+
+    :param writer: writer of the GIF workloads [string]
+
+    :return: name -> function returning (params, run) [dict]
+    """
+    table = {}
+    for frames in GIF_FRAMES:
+        table[f"gif/{frames}"] = lambda frames=frames: gifWorkload(frames, writer)
+    for samples in CONV_SIZES:
+        methods = ["auto", "fft", "oa"] + (["direct"] if samples <= DIRECT_MAX else [])
+        for method in methods:
+            table[f"conv/{method}/{samples:.0e}"] = lambda s=samples, m=method: convWorkload(s, m)
+    for sets in RLC_SETS:
+        table[f"rlc/vec/{sets}"] = lambda sets=sets: rlcVecWorkload(sets)
+    for method in ["foh", "zoh", "rk4"]:
+        for sets in RLC_SETS[:2]:
+            table[f"rlc/num-{method}/{sets}"] = lambda s=sets, m=method: rlcNumWorkload(s, m)
+    for sets in RLC_SYMBOLIC_SETS:
+        table[f"rlc/symbolic/{sets}"] = lambda sets=sets: rlcSymbolicWorkload(sets)
+    table["scene/Convolution"] = lambda: sceneWorkload("Convolution")
+    return table
+
+
+def metadata():
+    """
+    Machine and software versions the results were measured on
+    """
+    import importlib.metadata
+
+    versions = {}
+    for package in ["numpy", "scipy", "sympy", "matplotlib", "manim"]:
+        try:
+            versions[package] = importlib.metadata.version(package)
+        except importlib.metadata.PackageNotFoundError:
+            versions[package] = None
+
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+def timeWorkload(make, repeat, budget):
+    """
+    Run a workload up to repeat times, stopping early after budget seconds
+
+    The first run is a warm-up (imports, lambdify and sympy caches) and is
+    not part of the statistics, unless it is the only one that fits.
+
+    :return: result entry [dict]
+    """
+    params, run, *cleanup = make()
+
+    times = []
+    spent = 0.0
+    try:
+        for _ in range(repeat + 1):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            spent += elapsed
+            times.append(elapsed)
+            if spent > budget:
+                break
+    finally:
+        for f in cleanup:
+            f()
+
+    if len(times) > 1:
+        times = times[1:]
+
+    return {
+        "params": params,
+        "times": times,
+        "min": min(times),
+        "median": statistics.median(times),
+    }
+
+
+def runSuite(names, repeat=5, budget=10.0, writer="pillow", log=print):
+    """
+    :param names: workload names to run [list]
+    :param repeat: timed runs per workload [int]
+    :param budget: seconds after which a workload stops repeating [float]
+    :param writer: writer of the GIF workloads [string]
+
+    :return: results with metadata [dict]
+    """
+    table = workloads(writer)
+    results = {}
+    for name in names:
+        try:
+            results[name] = timeWorkload(table[name], repeat, budget)
+            log(f"{name:28s} {results[name]['min'] * 1e3:10.2f} ms")
+        except (ImportError, Skipped) as e:
+            results[name] = {"skipped": f"{type(e).__name__}: {e}"}
+            log(f"{name:28s} {'skipped':>13s} ({e})")
+
+    meta = metadata()
+    meta.update({"repeat": repeat, "budget": budget, "writer": writer})
+    return {"metadata": meta, "results": results}
+
+
+def compare(current, baseline, threshold):
+    """
+    Workloads slower than baseline by more than threshold
+
+    Only workloads measured in both runs with the same parameters are
+    compared. The best time of each run is used: unlike the median it is
+    barely affected by other processes competing for the machine.
+
+    :param threshold: allowed slowdown, 0.1 = 10% [float]
+
+    :return: rows (name, baseline, current, ratio, regression) [list of tuples]
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None or "min" not in base or "min" not in result:
+            continue
+        if base["params"] != result["params"]:
+            continue
+        ratio = result["min"] / base["min"]
+        rows.append((name, base["min"], result["min"], ratio, ratio > 1 + threshold))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", nargs="+", default=["*"], help="workload name patterns, e.g. 'conv/*'")
+    parser.add_argument("--list", action="store_true", help="list the workloads and exit")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per workload")
+    parser.add_argument("--budget", type=float, default=10.0, help="seconds after which a workload stops repeating")
+    parser.add_argument("--writer", default=None, help="GIF writer (default: ffmpeg if available, else pillow)")
+    parser.add_argument("--output", default=None, help="results file (default: benchmarks/<date>_<commit>.json)")
+    parser.add_argument("--baseline", default=str(BENCH_DIR / "baseline.json"), help="baseline results file")
+    parser.add_argument("--threshold", type=float, default=0.1, help="allowed slowdown before flagging (0.1 = 10%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="also store the results as the baseline")
+    args = parser.parse_args(argv)
+
+    writer = args.writer
+    if writer is None:
+        import shutil
+
+        writer = "ffmpeg" if shutil.which("ffmpeg") else "pillow"
+
+    names = [
+        name for name in workloads(writer)
+        if any(fnmatch.fnmatch(name, pattern) for pattern in args.only)
+    ]
+    if args.list:
+        print("\n".join(names))
+        return 0
+
+    current = runSuite(names, args.repeat, args.budget, writer)
+
+    meta = current["metadata"]
+    output = Path(args.output or BENCH_DIR / f"{meta['date'][:10]}_{meta['commit'] or 'nogit'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(current, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"results in {output}")
+
+    status = 0
+    baseline = Path(args.baseline)
+    if baseline.is_file() and not args.save_baseline:
+        rows = compare(current, json.loads(baseline.read_text(encoding="utf-8")), args.threshold)
+        print(f"\n{'workload':28s} {'baseline':>11s} {'current':>11s} {'ratio':>7s}")
+        for name, base, now, ratio, regression in rows:
+            flag = "  REGRESSION" if regression else ""
+            print(f"{name:28s} {base * 1e3:9.2f}ms {now * 1e3:9.2f}ms {ratio:7.2f}{flag}")
+        if any(row[-1] for row in rows):
+            status = 1
+
+    if args.save_baseline:
+        baseline.parent.mkdir(parents=True, exist_ok=True)
+        baseline.write_text(output.read_text(encoding="utf-8"), encoding="utf-8")
+        print(f"baseline saved to {baseline}")
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+Check the import time of the helper modules against a budget
+
+    python importbudget.py [--repeat 5] [utils=30 utils1=30 ...]
+
+Each module is imported in a fresh interpreter with -X importtime; the best
+of --repeat runs is compared with its budget (milliseconds), and none of
+the heavy dependencies may be loaded by the import alone.
+"""
+import argparse
+import re
+import subprocess
+import sys
+
+# orçamento de importação de cada módulo [ms]
+BUDGETS = {
+    "utils": 30,
+    "utils1": 30,
+    "sinais": 30,
+    "sinais.circuits": 30,
+    "sinais.convolution": 30,
+    "sinais.lazyimport": 10,
+}
+
+# dependências que só devem ser carregadas no primeiro uso
+HEAVY = ["numpy", "sympy", "scipy", "matplotlib", "IPython", "manim"]
+
+
+def importTime(module):
+    """
+    Cumulative import time of module in a fresh interpreter
+
+    :return: import time [ms] and heavy modules loaded by the import [tuple]
+    """
+    code = f"import sys, {module}; print(' '.join(m for m in {HEAVY!r} if m in sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True,
+    )
+
+    total = None
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s*(\d+)\s*\|\s*(\d+)\s*\|\s?(\S+)\s*$", line)
+        if match and match.group(3) == module:
+            total = int(match.group(2)) / 1000
+
+    return total, proc.stdout.split()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("budgets", nargs="*", help="module=milliseconds, overrides the defaults")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per module (best is kept)")
+    args = parser.parse_args(argv)
+
+    budgets = dict(BUDGETS)
+    for item in args.budgets:
+        module, _, ms = item.partition("=")
+        budgets[module] = float(ms) if ms else budgets.get(module, 30)
+
+    failed = False
+    for module, budget in budgets.items():
+        runs = [importTime(module) for _ in range(args.repeat)]
+        best = min(t for t, _ in runs)
+        heavy = sorted(set().union(*(h for _, h in runs)))
+        ok = best <= budget and not heavy
+        failed |= not ok
+
+        note = f"  loads {', '.join(heavy)}" if heavy else ""
+        print(f"{module:20s} {best:7.1f} ms  (budget {budget:g} ms)  {'ok' if ok else 'OVER'}{note}")
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,18 +1,40 @@
 from manim import *
+import numpy as np
+import sympy as sp
 from scipy.signal import convolve
 
+from sinais import convPiecewise, convTime
+from sinais.lambdacache import cachedLambdify
+from preview import PreviewKeyframes
+from sections import CachedSections
+from signalgraph import SlidingConvolution, axesPoints, stepGraph
+
+# variável de tempo dos sinais simbólicos
+t_sym = sp.symbols("t", real=True)
+u = sp.Heaviside
+FULL_WIDTH = (-config["frame_x_radius"], config["frame_x_radius"])
+
     
-class Convolution(Scene):
-    
-    def construct(self):
-        # formula da convolução 
+class Convolution(PreviewKeyframes, CachedSections, Scene):
+    """
+    Convolução de u(t) com u(t), em seções renderizadas só quando mudam
+    """
+
+    sections = ["intro", "exemplo", "degrau", "eixos", "janela", "creditos"]
+
+    amarelo = "#EB811B"
+    azul = "#1965B0"
+    texto = "#23373F"
 
-        amarelo = "#EB811B"
-        azul = "#1965B0"
-        texto = "#23373F"
+    def setup(self):
         self.camera.background_color = "#FAFAFA"
-        Text.set_default(color=texto, font="Calibri", font_size=64)
-        config.graph_color = texto
+        Text.set_default(color=self.texto, font="Calibri", font_size=64)
+        config.graph_color = self.texto
+
+    def intro(self):
+        amarelo, azul, texto = self.amarelo, self.azul, self.texto
+        # formula da convolução 
+
         linha_1 = Text("A convolução de duas funções").to_edge(UP)
         linha_2 = Text("é dada por")
         linha_2.next_to(linha_1, DOWN)
@@ -37,6 +59,11 @@ class Convolution(Scene):
         linha_3 = Text("Exemplo")
         self.play(FadeOut(linha_1), FadeOut(linha_2),FadeOut(formula),FadeIn(linha_3))
         self.wait(1)
+        self.formula, self.linha_3 = formula, linha_3
+
+    def exemplo(self):
+        amarelo, azul, texto = self.amarelo, self.azul, self.texto
+        linha_3 = self.linha_3
         
         linha_4_seja =  Text("Seja")
         linha_4_seja.shift(2*UP)
@@ -75,6 +102,11 @@ class Convolution(Scene):
         linha_4_e.shift(4*RIGHT)
         linha_5.shift(4*RIGHT)
         self.play(ReplacementTransform(linha_3, linha_4_seja),Write(linha_4),Write(linha_4_e),Write(linha_4_2) ,Write(linha_5))
+        self.linhas_exemplo = VGroup(linha_4_seja, linha_4, linha_4_e, linha_4_2, linha_5)
+
+    def degrau(self):
+        texto = self.texto
+        linha_4_seja, linha_4, linha_4_e, linha_4_2, linha_5 = self.linhas_exemplo
         self.wait(1)
         funcao_degrau = MathTex(
             r"u(t) = \begin{cases} 0, &  t < 0 \\ 1, &  t \geq 0 \end{cases}",color=texto,
@@ -88,6 +120,10 @@ class Convolution(Scene):
         self.wait(3)
         self.play(FadeOut(linha_4_seja),FadeOut(linha_4),FadeOut(linha_4_e),FadeOut(linha_4_2),FadeOut(linha_5),FadeOut(funcao_degrau))
         # create the graphs
+
+    def eixos(self):
+        amarelo, azul, texto = self.amarelo, self.azul, self.texto
+        formula = self.formula
         
        # x_graph = FunctionGraph(lambda t: 0.75 if t >= 0 else 0).set_color(amarelo)
         #h_graph = FunctionGraph(lambda t: 0.75 if t >= 0 else 0).set_color(azul)
@@ -139,9 +175,9 @@ class Convolution(Scene):
         
         #primeira parte 
         linha_6 = Text ("Na fórmula da convolução").next_to(ax1, UP)
-        x_graph = FunctionGraph(lambda t: 1 if t >= 0 else 0).set_color(amarelo)
+        x_graph = stepGraph(u(t_sym), t_sym, FULL_WIDTH).set_color(amarelo)
         x_graph.shift(2*UP)
-        h_graph = FunctionGraph(lambda t: 1 if t >= 0 else 0).set_color(azul)
+        h_graph = stepGraph(u(t_sym), t_sym, FULL_WIDTH).set_color(azul)
  
         labels_ax1 = ax1.get_axis_labels(
             MathTex("t"), MathTex(r"x(t) = u(t)")
@@ -163,9 +199,15 @@ class Convolution(Scene):
         formula.next_to(ax1,UP)
         self.play(FadeOut(labels_ax1),FadeOut(x_graph),FadeOut(labels_ax2),FadeOut(h_graph))
         self.play(ReplacementTransform(linha_6,formula))
+        self.eixos_janela = VGroup(ax1, ax2, ax3)
+
+    def janela(self):
+        amarelo, azul = self.amarelo, self.azul
+        formula = self.formula
+        ax1, ax2, ax3 = self.eixos_janela
         self.wait(3)
-        x_graph = FunctionGraph(lambda t: 1 if t >= 0 else 0).set_color(amarelo)
-        h_graph = FunctionGraph(lambda t: 0 if t >= 0 else 1).set_color(azul)
+        x_graph = stepGraph(u(t_sym), t_sym, FULL_WIDTH).set_color(amarelo)
+        h_graph = stepGraph(u(-t_sym), t_sym, FULL_WIDTH).set_color(azul)
         x_graph.shift(2*UP)
         
         labels_ax1 = ax1.get_axis_labels(
@@ -190,31 +232,187 @@ class Convolution(Scene):
         self.wait(1)
         self.play(Indicate(labels_ax2,color=azul),Create(h_graph))
      
-        y_graph = FunctionGraph(lambda t: t if t >= 0 else 0,x_range=[0,1.5]).set_color(GREEN)
-        linha_y = FunctionGraph(lambda t: 1 if t <= 0 else 0,x_range=[-10,0]).set_color(GREEN)
+        linha_y = stepGraph(u(-t_sym), t_sym, (-10, 0)).set_color(GREEN)
        
        # delete o eixo y negativo do ax1 
        
 
         
-        y_graph.shift(2*DOWN)
         linha_y.shift(3*DOWN)
+
+        # t desliza h(t-τ); área, y(t) e valor saem da sobreposição a cada quadro
+        tracker = ValueTracker(0)
+        tau = np.linspace(*FULL_WIDTH, 1000)
+        janela = SlidingConvolution(
+            tracker, tau, np.heaviside(tau, 1),
+            tau, np.heaviside(tau, 1),
+            lambda xs, ys: np.column_stack([xs, ys, np.zeros_like(xs)]) + 2*UP,
+            lambda ts, ys: np.column_stack([ts, ys, np.zeros_like(ts)]) + 2*DOWN,
+            color=GREEN,
+        )
+        y_graph = janela.trace
+        h_inicio = h_graph.get_center()
+        h_graph.add_updater(lambda m: m.move_to(h_inicio + tracker.get_value()*RIGHT))
         # Adiciona os gráficos à cena
-    
+        self.add(janela)
         self.play(
-            ApplyMethod(h_graph.shift, RIGHT*1.5, run_time=5),
+            tracker.animate.set_value(1.5),
             Create(linha_y),
-            Create(y_graph, run_time=5)
+            run_time=5,
+            rate_func=linear,
         )
+        h_graph.clear_updaters()
+        janela.clear_updaters()
         reticencias = MathTex(r"\cdots").next_to(y_graph, RIGHT)
       
         self.play(Indicate(labels_ax3,color=GREEN),Indicate(reticencias,color=GREEN))
         self.wait(3)
         self.play(FadeOut(y_graph),FadeOut(reticencias),FadeOut(linha_y),FadeOut(labels_ax1),FadeOut(labels_ax2),FadeOut(labels_ax3),FadeOut(h_graph),FadeOut(x_graph),FadeOut(ax1),FadeOut(ax2),FadeOut(ax3),FadeOut(formula))
+
+    def creditos(self):
         self.wait(1)
         nome = Text("Reinaldo-Kn",font="Jayadhira LILA EE 0.1").set_color(BLACK)
         make = Text("Feito por").set_color(BLACK)
         nome.next_to(make,DOWN)
         self.play(Create(make))
         self.play(Write(nome))
-        self.wait(2)
\ No newline at end of file
+        self.wait(2)
+
+
+class ConvolutionScene(PreviewKeyframes, Scene):
+    """
+    Sliding-window animation of y(t) = x(t)*h(t) for any pair of signals
+
+    Subclasses only set x, h and the windows. y(t) is computed once
+    (closed form when convPiecewise handles the signals, FFT otherwise) and
+    a single ValueTracker for t drives h(t-τ) and a SlidingConvolution,
+    which draws the overlap area and reads the y(t) trace and its value from
+    those samples. y(t) also sets the scale of the bottom axes.
+    """
+
+    var = t_sym
+    x = sp.Heaviside(var)
+    h = sp.Heaviside(var)
+    x_tex = r"x(\tau)"
+    h_tex = r"h(t-\tau)"
+    tau_range = (-6, 6)  # eixo τ (e t) dos gráficos
+    t_range = (-3, 4)  # valores de t percorridos pela janela
+    samples = 2000
+    run_time = 8
+
+    amarelo = "#EB811B"
+    azul = "#1965B0"
+    verde = GREEN
+    texto = "#23373F"
+
+    def sample(self):
+        """
+        Sample x(τ), h(s) and y(t) once for the whole animation
+        """
+        var = self.var
+        self.tau = np.linspace(*self.tau_range, self.samples)
+        x_func = cachedLambdify(var, self.x)
+        h_func = cachedLambdify(var, self.h)
+
+        def evaluate(f, grid):
+            return np.broadcast_to(np.asarray(f(grid), dtype=float), grid.shape)
+
+        self.x_num = evaluate(x_func, self.tau)
+
+        # h(t-τ) só precisa de h(s) com s = t - τ dentro deste intervalo
+        s_min = self.t_range[0] - self.tau_range[1]
+        s_max = self.t_range[1] - self.tau_range[0]
+        self.s = np.linspace(s_min, s_max, 2 * self.samples)
+        self.h_num = evaluate(h_func, self.s)
+
+        try:
+            y_func = cachedLambdify(var, convPiecewise(self.x, self.h, var))
+            self.y_num = evaluate(y_func, self.tau)
+        except (ValueError, NotImplementedError, TypeError):
+            # sem forma fechada (TypeError: instantes de quebra não numéricos);
+            # grade simétrica e larga o bastante para os sinais começarem dentro dela
+            span = 2 * max(abs(self.tau_range[0]), abs(self.tau_range[1]), abs(s_min), abs(s_max))
+            grid = np.linspace(-span, span, 8 * self.samples + 1)
+            y_grid, _ = convTime(evaluate(h_func, grid), evaluate(x_func, grid), grid, "same")
+            self.y_num = np.interp(self.tau, grid, y_grid)
+
+    def h_shift(self, t):
+        """
+        h(t-τ) on the τ grid, interpolated from the precomputed h(s)
+        """
+        return np.interp(t - self.tau, self.s, self.h_num)
+
+    def make_axes(self, values, shift):
+        top = max(np.max(values), 1)
+        bottom = min(np.min(values), 0)
+        return Axes(
+            x_range=[*self.tau_range, 1],
+            y_range=[bottom, 1.2 * top, (1.2 * top - bottom) / 2],
+            x_length=12,
+            y_length=1.8,
+            y_axis_config={"include_tip": False},
+        ).set_color(self.texto).shift(shift)
+
+    def construct(self):
+        self.camera.background_color = "#FAFAFA"
+        self.sample()
+
+        tracker = ValueTracker(self.t_range[0])
+
+        ax1 = self.make_axes(self.x_num, 2.5 * UP)
+        ax2 = self.make_axes(self.h_num, 0 * UP)
+        ax3 = self.make_axes(self.y_num, 2.5 * DOWN)
+
+        labels = VGroup(
+            MathTex(self.x_tex, color=self.amarelo).next_to(ax1, UP, buff=0.1).align_on_border(LEFT),
+            MathTex(self.h_tex, color=self.azul).next_to(ax2, UP, buff=0.1).align_on_border(LEFT),
+            MathTex("y(t)", color=self.verde).next_to(ax3, UP, buff=0.1).align_on_border(LEFT),
+        )
+
+        x_graph = stepGraph(self.x, self.var, self.tau_range, ax=ax1, color=self.amarelo)
+
+        h_graph = VMobject(color=self.azul)
+
+        def update_h(mob):
+            points = ax2.c2p(self.tau, self.h_shift(tracker.get_value()))
+            mob.set_points_as_corners(np.asarray(points).T)
+
+        update_h(h_graph)
+
+        janela = SlidingConvolution(
+            tracker, self.tau, self.x_num, self.s, self.h_num,
+            axesPoints(ax1), axesPoints(ax3), color=self.verde, y_num=self.y_num,
+        )
+
+        t_line = always_redraw(
+            lambda: DashedLine(
+                ax1.c2p(tracker.get_value(), 0),
+                ax3.c2p(tracker.get_value(), 0),
+                color=GRAY,
+                stroke_width=2,
+            )
+        )
+
+        self.play(Create(ax1), Create(ax2), Create(ax3), Write(labels))
+        self.play(Create(x_graph))
+        self.play(Create(h_graph))
+        self.add(janela, t_line)
+        h_graph.add_updater(update_h)
+        self.play(
+            tracker.animate.set_value(self.t_range[1]),
+            run_time=self.run_time,
+            rate_func=linear,
+        )
+        h_graph.clear_updaters()
+        janela.clear_updaters()
+        self.wait(2)
+
+
+class ConvolutionRectExp(ConvolutionScene):
+    """
+    x(t) = u(t+1) - u(t-1) e h(t) = e^{-t}u(t)
+    """
+
+    var = ConvolutionScene.var
+    x = sp.Heaviside(var + 1) - sp.Heaviside(var - 1)
+    h = sp.exp(-var) * sp.Heaviside(var)
@@ -0,0 +1,341 @@
+# -*- coding: utf-8 -*-
+"""
+Index, integrity check and size-bounded eviction of the manim media/ cache
+
+    python mediacache.py scan [--scene main.py]
+    python mediacache.py stats
+    python mediacache.py orphans [--delete]
+    python mediacache.py verify [--delete]
+    python mediacache.py evict --max-size 2G
+
+Every cached file is content addressed (its name is a hash), so the index
+only keeps hash -> size, last use and producing scene, in media/cache_index.json.
+"""
+import argparse
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+INDEX_NAME = "cache_index.json"
+
+# cabeçalho esperado de cada tipo de arquivo (checagem rápida de integridade)
+MAGIC = {
+    ".svg": (0, (b"<?xml", b"<svg")),
+    ".mp4": (4, (b"ftyp",)),
+    ".mov": (4, (b"ftyp",)),
+    ".png": (0, (b"\x89PNG",)),
+}
+
+UNITS = {"": 1, "K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+
+
+def parseSize(text):
+    """
+    "500M", "2G", "1.5G" or a number of bytes -> bytes [int]
+    """
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMGT]?)i?B?\s*", text.upper())
+    if match is None:
+        raise ValueError(f"invalid size: {text}")
+    return int(float(match.group(1)) * UNITS[match.group(2)])
+
+
+def formatSize(n):
+    for unit in ("B", "K", "M", "G"):
+        if n < 1024:
+            return f"{n:.0f}{unit}" if unit == "B" else f"{n:.1f}{unit}"
+        n /= 1024
+    return f"{n:.1f}T"
+
+
+def cachedFiles(media_dir):
+    """
+    Cached files of a media folder and the scene that produced them
+
+    :param media_dir: manim media folder [string]
+
+    :return: generator of (path, kind, scene) with kind "tex", "text", "section" or "partial" [tuple]
+    """
+    media = Path(media_dir)
+    for kind, folder in (("tex", "Tex"), ("text", "texts"), ("section", "section_cache")):
+        if (media / folder).is_dir():
+            for path in (media / folder).iterdir():
+                if path.is_file():
+                    yield path, kind, None
+
+    # videos/<arquivo>/<qualidade>/partial_movie_files/<cena>/<hash>.mp4
+    for scene_dir in media.glob("videos/*/*/partial_movie_files/*"):
+        scene = f"{scene_dir.parents[2].name}.{scene_dir.name}"
+        for path in scene_dir.iterdir():
+            if path.is_file() and path.suffix != ".txt":
+                yield path, "partial", scene
+
+
+def referencedPartials(media_dir):
+    """
+    Partial movies listed by the last render of each scene and quality
+
+    The list files hold absolute paths of the machine that rendered them,
+    so the files are matched by folder and name.
+    """
+    referenced = set()
+    for listing in Path(media_dir).glob("videos/*/*/partial_movie_files/*/partial_movie_file_list.txt"):
+        for line in listing.read_text(encoding="utf-8", errors="replace").splitlines():
+            match = re.match(r"file '(?:file:)?(.*)'", line.strip())
+            if match:
+                referenced.add(listing.parent / re.split(r"[\\/]", match.group(1))[-1])
+    return referenced
+
+
+class MediaCache:
+    """
+    Compact index of the media/ cache
+
+    :param media_dir: manim media folder [string]
+    """
+
+    def __init__(self, media_dir="media"):
+        self.media_dir = Path(media_dir)
+        self.path = self.media_dir / INDEX_NAME
+        self.entries = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+    def save(self):
+        tmp = self.path.with_name(self.path.name + f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def key(self, path):
+        return Path(path).relative_to(self.media_dir).as_posix()
+
+    def scan(self):
+        """
+        Bring the index up to date with the files on disk
+
+        Only new or modified files (size or mtime changed) are re-checked.
+
+        :return: number of new and removed entries [tuple]
+        """
+        seen = set()
+        new = 0
+        for path, kind, scene in cachedFiles(self.media_dir):
+            key = self.key(path)
+            seen.add(key)
+            st = path.stat()
+            entry = self.entries.get(key)
+            if entry is None or entry["size"] != st.st_size or entry["mtime"] != st.st_mtime:
+                new += entry is None
+                entry = {
+                    "size": st.st_size,
+                    "mtime": st.st_mtime,
+                    "last_used": max(st.st_atime, st.st_mtime),
+                    "kind": kind,
+                    "scene": scene if entry is None else entry.get("scene") or scene,
+                    "ok": None,
+                }
+                self.entries[key] = entry
+            else:
+                # atime só avança o último uso (pode estar desativado no disco)
+                entry["last_used"] = max(entry["last_used"], st.st_atime)
+
+        removed = [key for key in self.entries if key not in seen]
+        for key in removed:
+            del self.entries[key]
+
+        return new, len(removed)
+
+    def touch(self, keys, scene=None):
+        """
+        Mark entries as used now, optionally recording the scene that uses them
+        """
+        now = time.time()
+        for key in keys:
+            entry = self.entries.get(key)
+            if entry is not None:
+                entry["last_used"] = now
+                if scene is not None:
+                    entry["scene"] = scene
+
+    def attribute(self, scene_file):
+        """
+        Record scene_file as the user of the TeX SVGs its MathTex/Tex need
+
+        :param scene_file: scene file, collected statically by texprewarm [string]
+
+        :return: number of cached SVGs attributed [int]
+        """
+        from manim import config
+        from manim.utils.tex_file_writing import tex_hash
+        from texprewarm import collectTex, texExpressions
+
+        template = config["tex_template"]
+        calls, _ = collectTex(scene_file)
+        keys = set()
+        for name, tex_strings, options in calls:
+            for expression, environment in texExpressions(name, tex_strings, options):
+                code = template.get_texcode_for_expression_in_env(expression, environment)
+                keys |= {f"Tex/{tex_hash(code)}.svg", f"Tex/{tex_hash(code)}.tex"}
+
+        keys &= self.entries.keys()
+        self.touch(keys, Path(scene_file).stem)
+        return len(keys) // 2
+
+    def orphans(self):
+        """
+        .tex files without their .svg: failed or interrupted compiles
+        """
+        return sorted(
+            key for key, entry in self.entries.items()
+            if entry["kind"] == "tex" and key.endswith(".tex") and key[:-4] + ".svg" not in self.entries
+        )
+
+    def verify(self, full=False):
+        """
+        Check the header of every file not verified since it last changed
+
+        :param full: re-check every file [bool]
+
+        :return: keys of the corrupt files [list]
+        """
+        corrupt = []
+        for key, entry in self.entries.items():
+            if entry["ok"] is not None and not full:
+                if not entry["ok"]:
+                    corrupt.append(key)
+                continue
+
+            path = self.media_dir / key
+            suffix = path.suffix.lower()
+            # .empty marca uma seção sem animações (sections.py)
+            ok = entry["size"] > 0 or suffix == ".empty"
+            if ok and suffix in MAGIC:
+                offset, magics = MAGIC[suffix]
+                with open(path, "rb") as f:
+                    head = f.read(512)
+                ok = any(head[offset:].lstrip().startswith(m) for m in magics)
+            elif ok and suffix == ".tex":
+                # o .tex é gravado inteiro de uma vez pelo manim
+                with open(path, "rb") as f:
+                    f.seek(max(entry["size"] - 64, 0))
+                    ok = b"\\end{document}" in f.read()
+
+            entry["ok"] = ok
+            if not ok:
+                corrupt.append(key)
+
+        return sorted(corrupt)
+
+    def remove(self, keys):
+        """
+        Delete files and their index entries, with the .tex of a deleted .svg
+
+        :return: bytes freed [int]
+        """
+        freed = 0
+        for key in list(keys):
+            related = [key]
+            if key.startswith("Tex/") and key.endswith(".svg"):
+                related.append(key[:-4] + ".tex")
+            for k in related:
+                entry = self.entries.pop(k, None)
+                if entry is None:
+                    continue
+                try:
+                    (self.media_dir / k).unlink()
+                    freed += entry["size"]
+                except FileNotFoundError:
+                    pass
+        return freed
+
+    def totalSize(self):
+        return sum(entry["size"] for entry in self.entries.values())
+
+    def evict(self, max_bytes):
+        """
+        Delete least recently used files until the cache fits in max_bytes
+
+        Partial movies listed by the last render of a scene are kept while
+        anything else can go; orphan .tex files go first.
+
+        :param max_bytes: size cap [int]
+
+        :return: files deleted and bytes freed [tuple]
+        """
+        total = self.totalSize()
+        if total <= max_bytes:
+            return 0, 0
+
+        referenced = {self.key(p) for p in referencedPartials(self.media_dir)}
+        orphans = set(self.orphans())
+
+        def order(key):
+            entry = self.entries[key]
+            return (key not in orphans, key in referenced, entry["last_used"])
+
+        deleted = freed = 0
+        for key in sorted(self.entries, key=order):
+            if total - freed <= max_bytes:
+                break
+            if key not in self.entries or key.endswith(".tex") and key not in orphans:
+                # o .tex sai junto com o seu .svg
+                continue
+            freed += self.remove([key])
+            deleted += 1
+
+        return deleted, freed
+
+    def stats(self):
+        """
+        Number of files and bytes per kind and per scene [dict]
+        """
+        stats = {}
+        for entry in self.entries.values():
+            for group in (entry["kind"], f"scene {entry['scene']}" if entry["scene"] else None):
+                if group is not None:
+                    count, size = stats.get(group, (0, 0))
+                    stats[group] = (count + 1, size + entry["size"])
+        return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("command", choices=["scan", "stats", "orphans", "verify", "evict"])
+    parser.add_argument("--media_dir", default="media", help="manim media folder")
+    parser.add_argument("--scene", action="append", default=[], help="scene file whose TeX is marked as used")
+    parser.add_argument("--max-size", default=None, help="size cap for evict, e.g. 2G")
+    parser.add_argument("--delete", action="store_true", help="delete the orphan or corrupt files found")
+    parser.add_argument("--full", action="store_true", help="verify every file, not only new ones")
+    args = parser.parse_args(argv)
+
+    cache = MediaCache(args.media_dir)
+    new, removed = cache.scan()
+
+    if args.command == "scan":
+        print(f"{len(cache.entries)} files, {formatSize(cache.totalSize())} ({new} new, {removed} gone)")
+        for scene_file in args.scene:
+            print(f"{scene_file}: {cache.attribute(scene_file)} TeX SVGs in use")
+    elif args.command == "stats":
+        for group, (count, size) in sorted(cache.stats().items()):
+            print(f"{group:40s} {count:6d} {formatSize(size):>8s}")
+        print(f"{'total':40s} {len(cache.entries):6d} {formatSize(cache.totalSize()):>8s}")
+    elif args.command in ("orphans", "verify"):
+        keys = cache.orphans() if args.command == "orphans" else cache.verify(args.full)
+        for key in keys:
+            print(key)
+        if args.delete:
+            print(f"freed {formatSize(cache.remove(keys))}")
+    elif args.command == "evict":
+        if args.max_size is None:
+            parser.error("evict needs --max-size")
+        deleted, freed = cache.evict(parseSize(args.max_size))
+        print(f"deleted {deleted} files, freed {formatSize(freed)}")
+
+    cache.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import os
+from pathlib import Path
+
+from manim import config
+
+# miniaturas da folha de contato
+THUMB_WIDTH = 320
+PLAYS_PER_ROW = 3
+
+
+def previewEnabled():
+    return os.environ.get("SINAIS_PREVIEW", "") not in ("", "0")
+
+
+class PreviewKeyframes:
+    """
+    Scene mixin that saves only the first and last frame of each play/wait
+
+    With SINAIS_PREVIEW=1 (or preview_keyframes = True on the scene) nothing
+    is encoded: animations still run their updaters frame by frame, but
+    only two frames per play() or wait() are rasterized, saved as PNGs in
+    media/images/<file>/<Scene>_preview/ and gathered in a contact sheet.
+
+        SINAIS_PREVIEW=1 manim -ql main.py Convolution
+    """
+
+    preview_keyframes = False
+
+    def __init__(self, *args, **kwargs):
+        self.preview_keyframes = self.preview_keyframes or previewEnabled()
+        if self.preview_keyframes:
+            # sem vídeo e sem o hash de cada play (que só serve ao cache de vídeo)
+            config.write_to_movie = False
+            config.disable_caching = True
+        super().__init__(*args, **kwargs)
+        self.keyframes = []
+
+    def previewDir(self):
+        writer = self.renderer.file_writer
+        return Path(writer.image_file_path).parent / f"{type(self).__name__}_preview"
+
+    def saveKeyframe(self, label):
+        from PIL import Image
+
+        renderer = self.renderer
+        static, renderer.static_image = renderer.static_image, None
+        renderer.update_frame(self)
+        renderer.static_image = static
+
+        folder = self.previewDir()
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / f"{renderer.num_plays:04d}_{label}.png"
+        Image.fromarray(renderer.get_frame()).save(path)
+        self.keyframes.append(path)
+
+    def begin_animations(self):
+        super().begin_animations()
+        if self.preview_keyframes and not self.renderer.skip_animations:
+            self.saveKeyframe("first")
+
+    def play_internal(self, skip_rendering=False):
+        # os updaters rodam quadro a quadro, só a rasterização é pulada
+        super().play_internal(skip_rendering or self.preview_keyframes)
+
+    def play(self, *args, **kwargs):
+        super().play(*args, **kwargs)
+        if self.preview_keyframes and not self.renderer.skip_animations:
+            # num_plays já avançou: o último quadro fica com o mesmo índice do primeiro
+            self.renderer.num_plays -= 1
+            try:
+                self.saveKeyframe("last")
+            finally:
+                self.renderer.num_plays += 1
+
+    def contactSheet(self):
+        """
+        One image with the first/last frame pairs of every play, in order
+        """
+        from PIL import Image, ImageDraw
+
+        if not self.keyframes:
+            return None
+
+        frames = [Image.open(path) for path in self.keyframes]
+        width = THUMB_WIDTH
+        height = round(frames[0].height * width / frames[0].width)
+        label = 16
+        columns = 2 * PLAYS_PER_ROW
+        rows = -(-len(frames) // columns)
+
+        sheet = Image.new("RGB", (columns * width, rows * (height + label)), "white")
+        draw = ImageDraw.Draw(sheet)
+        for k, (path, frame) in enumerate(zip(self.keyframes, frames)):
+            x, y = (k % columns) * width, (k // columns) * (height + label)
+            sheet.paste(frame.convert("RGB").resize((width, height)), (x, y + label))
+            draw.text((x + 4, y + 2), path.stem, fill="black")
+
+        path = self.previewDir() / "contact_sheet.png"
+        sheet.save(path)
+        return path
+
+    def render(self, preview=False):
+        if self.preview_keyframes and self.previewDir().is_dir():
+            for old in self.previewDir().glob("*.png"):
+                old.unlink()
+
+        rerun = super().render(preview)
+        if self.preview_keyframes and not rerun:
+            path = self.contactSheet()
+            if path is not None:
+                print(f"{len(self.keyframes)} keyframes, contact sheet at {path}")
+        return rerun
@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+"""
+Render several (scene, quality) jobs on a local process pool
+
+    python renderfarm.py main.py:Convolution:l main.py:Convolution:1080p60 main.py:Convolution:1920p60
+
+Scenes built on sections.CachedSections are split by section: each worker
+renders one section into the shared section cache and a last pass only
+concatenates them. Other scenes are split into ranges of animation indexes
+(manim -n) rendered separately and concatenated with a stream copy.
+
+Every worker has its own media folder, so partial movies never collide,
+and its own texts/ folder: Pango writes the Text SVGs in place, and two
+workers rendering the same string would read each other's half-written
+file. All workers share media/Tex, whose expressions are prewarmed once
+for every scene file before the workers start, so no two workers compile
+the same expression at the same time.
+"""
+import argparse
+import importlib.util
+import os
+import re
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+def qualityConfig(quality):
+    """
+    manim config entries of a quality: "l", "high_quality" or "<height>p<fps>"
+
+    :return: config entries [dict]
+    """
+    quality = QUALITIES.get(quality, quality)
+    match = re.fullmatch(r"(\d+)p(\d+)", quality)
+    if match is None:
+        return {"quality": quality}
+
+    height, fps = int(match.group(1)), int(match.group(2))
+    width = 2 * round(height * 16 / 9 / 2)
+    return {"pixel_height": height, "pixel_width": width, "frame_rate": fps}
+
+
+def parseJob(text):
+    """
+    "file.py:Scene:quality" -> (file, scene, quality)
+    """
+    parts = text.rsplit(":", 2)
+    if len(parts) != 3:
+        raise ValueError(f"job must be file.py:Scene:quality, got {text}")
+    return tuple(parts)
+
+
+def _loadScene(path, scene):
+    name = "_farm_" + re.sub(r"\W", "_", os.path.splitext(os.path.abspath(path))[0])
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, scene)
+
+
+def _render(shard):
+    """
+    Worker: render one shard of a job with its own manim config
+
+    :return: elapsed time and number of plays [tuple]
+    """
+    from manim import tempconfig
+
+    start = time.perf_counter()
+    env = shard.get("env", {})
+    old = {key: os.environ.get(key) for key in env}
+    os.environ.update(env)
+    try:
+        with tempconfig(shard["config"]):
+            scene = _loadScene(shard["file"], shard["scene"])()
+            scene.render()
+            plays = scene.renderer.num_plays
+    finally:
+        for key, value in old.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+    return time.perf_counter() - start, plays
+
+
+def _concat(parts, output):
+    """
+    Stream copy of the part movies into output
+    """
+    from manim import config
+
+    listing = Path(output).with_suffix(".parts.txt")
+    with open(listing, "w", encoding="utf-8") as f:
+        for part in parts:
+            f.write(f"file 'file:{Path(part).resolve().as_posix()}'\n")
+
+    cmd = [
+        config.ffmpeg_executable, "-y", "-loglevel", "error",
+        "-f", "concat", "-safe", "0", "-i", str(listing),
+        "-c", "copy", str(output),
+    ]
+    try:
+        if subprocess.run(cmd).returncode != 0:
+            raise RuntimeError(f"ffmpeg failed writing {output}")
+    finally:
+        listing.unlink()
+
+
+class RenderJob:
+    """
+    One (scene, quality) job split into shards
+
+    :param file: scene file [string]
+    :param scene: scene class name [string]
+    :param quality: "l", "m", "h", "p", "k", a manim quality name or "<height>p<fps>" [string]
+    :param media_dir: media folder of the final output [string]
+    :param shards: number of animation ranges for scenes without sections [int]
+    """
+
+    def __init__(self, file, scene, quality, media_dir="media", shards=4):
+        self.file = file
+        self.scene = scene
+        self.quality = quality
+        self.media_dir = Path(media_dir).resolve()
+        self.shards = shards
+        self.name = f"{Path(file).stem}.{scene}@{quality}"
+        self.start = None
+        self.shard_time = 0.0
+        self.wall = None
+
+        self.config = dict(qualityConfig(quality))
+        self.config.update({
+            "media_dir": str(self.media_dir),
+            # nome da pasta videos/<arquivo>/ como na linha de comando do manim
+            "input_file": str(Path(file).resolve()),
+            # cache de TeX compartilhado (pré-compilado em runFarm); o de
+            # textos é trocado por um por worker em workerConfig
+            "tex_dir": str(self.media_dir / "Tex"),
+            "text_dir": str(self.media_dir / "texts"),
+            "disable_caching": False,
+            "write_to_movie": True,
+            "progress_bar": "none",
+        })
+
+    def workerConfig(self, k, **extra):
+        folder = self.media_dir / "farm" / f"{Path(self.file).stem}_{self.scene}_{self.quality}" / f"{k:03d}"
+        return dict(self.config, media_dir=str(folder), text_dir=str(folder / "texts"), **extra)
+
+    def plan(self):
+        """
+        Shards of the job and how to assemble them
+
+        :return: shard descriptions for _render [list of dicts]
+        """
+        from manim import config as cfg, tempconfig
+
+        scene_cls = _loadScene(self.file, self.scene)
+        sections = getattr(scene_cls, "sections", None)
+        env = {"SINAIS_SECTION_CACHE": str(self.media_dir / "section_cache")}
+
+        if sections:
+            self.mode = "section"
+            return [
+                {
+                    "file": self.file, "scene": self.scene,
+                    "config": self.workerConfig(k),
+                    "env": dict(env, SINAIS_SECTIONS=name),
+                }
+                for k, name in enumerate(sections)
+            ]
+
+        # conta as animações com uma passada sem quadros
+        self.mode = "animation"
+        with tempconfig(dict(self.config, dry_run=True)):
+            scene = scene_cls()
+            scene.render()
+            plays = scene.renderer.num_plays
+
+        shards = max(1, min(self.shards, plays))
+        bounds = [round(k * plays / shards) for k in range(shards + 1)]
+        self.parts = []
+        plan = []
+        for k in range(shards):
+            # -n a,b renderiza as animações a..b (inclusive)
+            first, last = bounds[k], bounds[k + 1] - 1
+            config = self.workerConfig(
+                k, from_animation_number=first, upto_animation_number=last,
+                output_file=f"{self.scene}_{k:03d}",
+            )
+            with tempconfig(config):
+                video_dir = cfg.get_dir("video_dir", module_name=Path(self.file).stem, scene_name=self.scene)
+                self.parts.append(video_dir / f"{self.scene}_{k:03d}{cfg.movie_file_extension}")
+            plan.append({"file": self.file, "scene": self.scene, "config": config})
+        return plan
+
+    def outputPath(self):
+        """
+        Final movie, in the usual manim output folder of media_dir
+        """
+        from manim import config as cfg, tempconfig
+
+        with tempconfig(self.config):
+            video_dir = cfg.get_dir("video_dir", module_name=Path(self.file).stem, scene_name=self.scene)
+            return video_dir / f"{self.scene}{cfg.movie_file_extension}"
+
+    def assemble(self):
+        """
+        Join the shards into outputPath()
+        """
+        if self.mode == "section":
+            # todas as seções estão no cache: a passada final só concatena
+            _render({
+                "file": self.file, "scene": self.scene, "config": self.config,
+                "env": {"SINAIS_SECTION_CACHE": str(self.media_dir / "section_cache")},
+            })
+            return
+
+        output = self.outputPath()
+        output.parent.mkdir(parents=True, exist_ok=True)
+        _concat(self.parts, output)
+
+
+def runFarm(jobs, workers=None, prewarm=True):
+    """
+    Render every job, shards of all jobs sharing one process pool
+
+    :param jobs: RenderJob list
+    :param workers: number of processes (None uses every core) [int]
+    :param prewarm: compile the TeX of every scene file into the shared media/Tex
+                    before starting; Text is cached per worker and not prewarmed [bool]
+
+    :return: the jobs, with wall and shard times filled in [list]
+    """
+    from manim import config
+
+    if prewarm:
+        from texprewarm import prewarmFile
+
+        for media_dir in {job.media_dir for job in jobs}:
+            config.media_dir = str(media_dir)
+            config.tex_dir = str(media_dir / "Tex")
+            for file in {job.file for job in jobs if job.media_dir == media_dir}:
+                prewarmFile(file, workers)
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = {}
+        for job in jobs:
+            job.start = time.perf_counter()
+            shards = job.plan()
+            job.left = len(shards)
+            for shard in shards:
+                pending[pool.submit(_render, shard)] = job
+
+        for future in as_completed(pending):
+            job = pending[future]
+            elapsed, _ = future.result()
+            job.shard_time += elapsed
+            job.left -= 1
+            if job.left == 0:
+                # montagem no processo principal enquanto os workers seguem
+                job.assemble()
+                job.wall = time.perf_counter() - job.start
+
+    return jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("jobs", nargs="+", help="file.py:Scene:quality (quality l, m, h, p, k or e.g. 1920p60)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes")
+    parser.add_argument("--shards", type=int, default=None, help="animation ranges per scene without sections")
+    parser.add_argument("--media_dir", default="media", help="manim media folder")
+    parser.add_argument("--no-prewarm", action="store_true", help="skip the TeX prewarm")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    jobs = [
+        RenderJob(*parseJob(text), media_dir=args.media_dir, shards=args.shards or workers)
+        for text in args.jobs
+    ]
+
+    start = time.perf_counter()
+    runFarm(jobs, workers, not args.no_prewarm)
+
+    print(f"{'job':40s} {'mode':>9s} {'wall':>9s} {'shards':>9s}")
+    for job in jobs:
+        print(f"{job.name:40s} {job.mode:>9s} {job.wall:8.1f}s {job.shard_time:8.1f}s")
+    print(f"{'total':40s} {'':>9s} {time.perf_counter() - start:8.1f}s")
+
+
+if __name__ == "__main__":
+    main()
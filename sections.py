@@ -0,0 +1,175 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import inspect
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+from manim import Mobject, __version__, config
+from manim.utils.file_ops import open_media_file, write_to_movie
+
+from sourcehash import skeletonHash, sourceHash
+
+
+def _hashMobject(hasher, mob):
+    for sub in mob.get_family():
+        hasher.update(type(sub).__name__.encode())
+        hasher.update(np.ascontiguousarray(sub.points).tobytes())
+        for attr in ("fill_rgbas", "stroke_rgbas", "background_stroke_rgbas", "stroke_width", "z_index"):
+            value = getattr(sub, attr, None)
+            if value is not None:
+                hasher.update(np.ascontiguousarray(value, dtype=float).tobytes())
+
+
+class CachedSections:
+    """
+    Scene mixin that renders only the sections whose inputs changed
+
+    The scene lists its section methods in `sections` instead of writing
+    construct(). Each section is keyed on its own source code, on the rest
+    of the scene file (module code, setup, class attributes, other methods),
+    on the local modules it imports (see sourcehash), on the state of the
+    scene when it starts (mobjects on screen and every mobject kept in an
+    attribute) and on the render settings. Sections found in the cache still
+    run, with skip_animations, only to rebuild the state for the next ones;
+    manim's own concat of the partial movies is skipped and the final movie
+    is a stream copy of the cached section videos.
+
+        class Convolution(CachedSections, Scene):
+            sections = ["intro", "exemplo", ...]
+
+    The cache lives in media/section_cache (SINAIS_SECTION_CACHE overrides
+    it). SINAIS_SECTIONS, a comma separated list of section names, renders
+    only those sections and skips the final concat, so a render farm can
+    split one scene across processes.
+    """
+
+    sections = []
+
+    def __init__(self, *args, **kwargs):
+        # os vídeos de cada seção só são gravados com save_sections
+        if write_to_movie():
+            config.save_sections = True
+        super().__init__(*args, **kwargs)
+        self.section_cache = []
+        self._sources = None
+        self._scene_attrs = set(vars(self))
+
+    def cacheDir(self):
+        folder = os.environ.get("SINAIS_SECTION_CACHE")
+        return Path(folder) if folder else Path(config.media_dir) / "section_cache"
+
+    def onlySections(self):
+        only = os.environ.get("SINAIS_SECTIONS")
+        return None if not only else set(only.split(","))
+
+    def stateHash(self):
+        """
+        Hash of the current scene state, as seen by the next section
+        """
+        hasher = hashlib.sha256()
+        hasher.update(str(self.camera.background_color).encode())
+        for mob in self.mobjects:
+            _hashMobject(hasher, mob)
+
+        # estado guardado pelas seções anteriores (objetos e valores simples)
+        for name in sorted(set(vars(self)) - self._scene_attrs):
+            value = getattr(self, name)
+            hasher.update(name.encode())
+            if isinstance(value, Mobject):
+                _hashMobject(hasher, value)
+            elif isinstance(value, (str, int, float, tuple)):
+                hasher.update(repr(value).encode())
+
+        return hasher.hexdigest()
+
+    def sourcesHash(self):
+        """
+        Hash of the scene file minus the section methods, and of the local
+        modules it imports
+        """
+        if self._sources is None:
+            path = inspect.getsourcefile(type(self))
+            self._sources = (
+                skeletonHash(path, type(self).__name__, self.sections)
+                + sourceHash(path, include_self=False)
+            )
+        return self._sources
+
+    def sectionKey(self, name):
+        hasher = hashlib.sha256()
+        hasher.update(inspect.getsource(getattr(type(self), name)).encode())
+        hasher.update(self.sourcesHash().encode())
+        hasher.update(self.stateHash().encode())
+        hasher.update(repr((
+            __version__, type(self).__name__,
+            config.pixel_width, config.pixel_height, config.frame_rate,
+            config.movie_file_extension, config.transparent,
+        )).encode())
+        return hasher.hexdigest()[:32]
+
+    def construct(self):
+        cache = write_to_movie() and not config.dry_run
+        only = self.onlySections()
+        for name in self.sections:
+            key = self.sectionKey(name)
+            path = self.cacheDir() / f"{key}{config.movie_file_extension}"
+            cached = cache and (path.exists() or path.with_suffix(".empty").exists())
+            # fora da lista: só reconstrói o estado, sem renderizar nem guardar
+            cached = cached or (only is not None and name not in only)
+            self.next_section(name, skip_animations=cached)
+            getattr(self, name)()
+            self.section_cache.append((name, path, cached))
+
+    def storeSections(self):
+        """
+        Copy the freshly rendered section videos into the cache
+
+        :return: cached videos of all sections, in order [list of Paths]
+        """
+        writer = self.renderer.file_writer
+        rendered = {}
+        for section in writer.sections:
+            if section.video is not None and not section.skip_animations:
+                rendered.setdefault(section.name, []).append(writer.sections_output_dir / section.video)
+
+        self.cacheDir().mkdir(parents=True, exist_ok=True)
+        videos = []
+        for name, path, cached in self.section_cache:
+            if not cached:
+                if rendered.get(name):
+                    shutil.copyfile(rendered[name].pop(0), path)
+                else:
+                    # seção sem animações: marca para não renderizar de novo
+                    path.with_suffix(".empty").touch()
+            if path.exists():
+                videos.append(path)
+
+        return videos
+
+    def render(self, preview=False):
+        if not write_to_movie() or config.dry_run:
+            return super().render(preview)
+
+        # abre o vídeo só depois de montado a partir das seções
+        show = preview or config["preview"]
+        browse = config["show_in_file_browser"]
+        config["preview"] = config["show_in_file_browser"] = False
+        # o filme final sai dos vídeos das seções: sem o concat das parciais
+        self.renderer.file_writer.combine_to_movie = lambda: None
+        try:
+            rerun = super().render()
+        finally:
+            config["preview"], config["show_in_file_browser"] = show, browse
+        if rerun:
+            return rerun
+
+        videos = self.storeSections()
+        writer = self.renderer.file_writer
+        if videos and self.onlySections() is None:
+            writer.combine_files(videos, writer.movie_file_path)
+            writer.print_file_ready_message(writer.movie_file_path)
+
+        if show or browse:
+            open_media_file(writer)
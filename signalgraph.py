@@ -0,0 +1,329 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import sympy as sp
+from manim import UR, DecimalNumber, VGroup, VMobject
+
+from sinais.lambdacache import cachedLambdify
+
+# acima disso h amostrado não é tratado como constante por partes
+MAX_PIECES = 16
+
+
+def breakpoints(expr, var, lo, hi):
+    """
+    Instants in (lo, hi) where a Heaviside/Piecewise/sign expression may jump
+
+    :param expr: signal [sympy expr]
+    :param var: time variable [sympy variable]
+    :param lo: start of the interval [float]
+    :param hi: end of the interval [float]
+
+    :return: sorted breakpoints [list of floats]
+    """
+    args = [e.args[0] for e in expr.atoms(sp.Heaviside, sp.sign)]
+    for pw in expr.atoms(sp.Piecewise):
+        for _, cond in pw.args:
+            args += [rel.lhs - rel.rhs for rel in cond.atoms(sp.core.relational.Relational)]
+
+    points = set()
+    for arg in args:
+        if not arg.has(var):
+            continue
+        for sol in sp.solve(sp.Eq(arg, 0), var):
+            if sol.is_real and lo < float(sol) < hi:
+                points.add(float(sol))
+
+    return sorted(points)
+
+
+def graphPoints(expr, var, lo, hi, samples_per_unit=50):
+    """
+    Polyline of a signal with exact vertical edges at its discontinuities
+
+    Each smooth piece is evaluated in one vectorized call, with one-sided
+    limits at its ends, and collinear samples are dropped: constant and
+    linear pieces end up with only two points.
+
+    :param expr: signal [sympy expr]
+    :param var: time variable [sympy variable]
+    :param lo: start of the interval [float]
+    :param hi: end of the interval [float]
+    :param samples_per_unit: samples per time unit on curved pieces [int]
+
+    :return ts, ys: polyline coordinates [np arrays]
+    """
+    func = cachedLambdify(var, expr)
+    edges = [lo] + breakpoints(expr, var, lo, hi) + [hi]
+    eps = 1e-9 * max(1.0, abs(lo), abs(hi))
+
+    ts, ys = [], []
+    for a, b in zip(edges[:-1], edges[1:]):
+        n = max(2, int(np.ceil((b - a) * samples_per_unit)) + 1)
+        seg = np.linspace(a, b, n)
+
+        # limites laterais nas bordas do trecho
+        probe = seg.copy()
+        probe[0] += eps
+        probe[-1] -= eps
+        val = np.broadcast_to(np.asarray(func(probe), dtype=float), probe.shape)
+
+        # descarta amostras colineares com as vizinhas
+        curv = np.abs(val[:-2] - 2 * val[1:-1] + val[2:])
+        keep = np.concatenate(([True], curv > 1e-6 * (1 + np.max(np.abs(val))), [True]))
+
+        ts.append(seg[keep])
+        ys.append(val[keep])
+
+    return np.concatenate(ts), np.concatenate(ys)
+
+
+def stepGraph(expr, var, x_range, ax=None, samples_per_unit=50, **kwargs):
+    """
+    Graph of a signal with pixel-exact steps, replacement for FunctionGraph
+
+    :param expr: signal [sympy expr]
+    :param var: time variable [sympy variable]
+    :param x_range: (start, end) of the graph [tuple]
+    :param ax: Axes of the graph, None for scene coordinates like FunctionGraph
+    :param samples_per_unit: samples per time unit on curved pieces [int]
+    :param kwargs: VMobject options (color, stroke_width, ...)
+
+    :return: graph [VMobject]
+    """
+    ts, ys = graphPoints(expr, var, x_range[0], x_range[1], samples_per_unit)
+
+    if ax is None:
+        points = np.column_stack([ts, ys, np.zeros_like(ts)])
+    else:
+        points = np.asarray(ax.c2p(ts, ys)).T
+
+    return VMobject(**kwargs).set_points_as_corners(points)
+
+
+def axesPoints(ax):
+    """
+    Vectorized coordinates -> scene points function of an Axes
+
+    :param ax: manim Axes
+
+    :return: function (xs, ys) -> array of points of shape (n, 3) [callable]
+    """
+    return lambda xs, ys: np.asarray(ax.c2p(xs, ys)).T.reshape(-1, 3)
+
+
+class ProductArea(VMobject):
+    """
+    Area under x(τ)h(t-τ) as one closed polygon
+
+    The product is evaluated on a fixed τ grid from precomputed samples, only
+    over the τ where h(t-τ) may be nonzero, and set_t only rewrites the
+    points of this single mobject: the cost per frame grows with the width
+    of the window, not with the whole grid.
+
+    :param to_point: function (xs, ys) -> points of shape (n, 3), e.g. axesPoints(ax) [callable]
+    :param tau: τ grid [np array]
+    :param x_num: x(τ) on the grid [np array]
+    :param h_shift: function (t, τ) -> h(t-τ), None for the area under x alone [callable]
+    :param t: initial value of t [float]
+    :param window: function t -> (lo, hi), slice of the grid outside of which h(t-τ) is zero,
+                   None for the whole grid [callable]
+    :param kwargs: VMobject options (color, fill_opacity, ...)
+    """
+
+    def __init__(self, to_point, tau, x_num, h_shift=None, t=0, window=None, **kwargs):
+        kwargs.setdefault("stroke_width", 0)
+        kwargs.setdefault("fill_opacity", 0.5)
+        super().__init__(**kwargs)
+        self.to_point = to_point
+        self.tau = np.asarray(tau, dtype=float)
+        self.x_num = np.broadcast_to(np.asarray(x_num, dtype=float), self.tau.shape)
+        self.h_shift = h_shift
+        self.window = window
+        self.set_t(t)
+
+    def set_t(self, t):
+        """
+        Move the window to t, updating the polygon in place
+        """
+        start, stop = (0, len(self.tau)) if self.window is None else self.window(t)
+        product = self.x_num[start:stop]
+        if self.h_shift is not None:
+            product = product * self.h_shift(t, self.tau[start:stop])
+
+        # só o trecho em que o produto não se anula (com uma amostra de folga)
+        nonzero = np.flatnonzero(product)
+        if len(nonzero) == 0:
+            corner = self.to_point(self.tau[:1], np.zeros(1))
+            return self.set_points_as_corners(np.vstack([corner, corner]))
+
+        lo = max(nonzero[0] - 1, 0)
+        hi = min(nonzero[-1] + 2, len(product))
+        tau = self.tau[start + lo:start + hi]
+
+        xs = np.concatenate([tau, tau[::-1]])
+        ys = np.concatenate([product[lo:hi], np.zeros(len(tau))])
+        points = self.to_point(xs, ys)
+
+        return self.set_points_as_corners(np.vstack([points, points[:1]]))
+
+
+class SlidingConvolution(VGroup):
+    """
+    Overlap area, y(t) trace and numeric readout of a sliding convolution
+
+    One updater, driven by the tracker of t, refreshes the three parts.
+
+    When y(t) is given (e.g. the closed form of convPiecewise) it is only
+    interpolated at t. Otherwise, when h is piecewise constant (steps, rects, staircases of up to
+    MAX_PIECES levels) y(t) comes from prefix sums of x, in constant time per
+    piece and frame. For any other h the product is summed over the τ where
+    h(t-τ) is nonzero, so a frame costs O(width of h), not O(change of t);
+    the overlap area has the same cost for every h. While t moves forward
+    the trace only gets the new point appended; it is rebuilt from the
+    stored history when t goes back.
+
+    :param tracker: ValueTracker of t
+    :param tau: uniform τ grid [np array]
+    :param x_num: x(τ) on the grid [np array]
+    :param s: grid of h [np array], covering every t-τ visited
+    :param h_num: h(s) on its grid [np array]
+    :param area_point: function (xs, ys) -> points of the shaded area, e.g. axesPoints(ax) [callable]
+    :param trace_point: function (ts, ys) -> points of the y(t) trace [callable]
+    :param color: color of the area, trace and readout
+    :param readout: show the numeric value of y(t) [bool]
+    :param y_num: y(t) on the τ grid, None to integrate the overlap every frame [np array]
+    """
+
+    def __init__(self, tracker, tau, x_num, s, h_num, area_point, trace_point,
+                 color=None, readout=True, y_num=None, **kwargs):
+        super().__init__(**kwargs)
+        self.tracker = tracker
+        self.tau = np.asarray(tau, dtype=float)
+        self.x_num = np.broadcast_to(np.asarray(x_num, dtype=float), self.tau.shape)
+        self.s = np.asarray(s, dtype=float)
+        self.h_num = np.broadcast_to(np.asarray(h_num, dtype=float), self.s.shape)
+        self.dtau = self.tau[1] - self.tau[0]
+        self.trace_point = trace_point
+        self.y_num = None if y_num is None else np.broadcast_to(np.asarray(y_num, dtype=float), self.tau.shape)
+
+        # suporte de h: fora de [s_lo, s_hi] h(t-τ) é nulo
+        nonzero = np.flatnonzero(self.h_num)
+        if len(nonzero):
+            self.support = (self.s[nonzero[0]], self.s[nonzero[-1]])
+        else:
+            self.support = (self.s[0], self.s[0] - 1)
+
+        # h constante por partes? (u(t), u(t+1)-u(t-1), escadas, ...)
+        self.pieces = self.constant_pieces() if self.y_num is None else None
+        if self.pieces is not None:
+            self.prefix = np.concatenate(([0], np.cumsum(self.x_num) * self.dtau))
+
+        self.area = ProductArea(
+            area_point, self.tau, self.x_num, self.h_shift, t=tracker.get_value(), window=self.window,
+        )
+        self.trace = VMobject()
+        self.add(self.area, self.trace)
+        if readout:
+            self.readout = DecimalNumber(0, num_decimal_places=2)
+            self.add(self.readout)
+        else:
+            self.readout = None
+
+        if color is not None:
+            self.area.set_fill(color)
+            self.trace.set_stroke(color)
+            if self.readout is not None:
+                self.readout.set_color(color)
+
+        self.history_t = []
+        self.history_y = []
+        self.update_frame(tracker.get_value())
+        self.add_updater(lambda mob: mob.update_frame(mob.tracker.get_value()))
+
+    def constant_pieces(self):
+        """
+        Levels of h as (level, s_a, s_b), None if h is not piecewise constant
+        """
+        nonzero = np.flatnonzero(self.h_num)
+        if len(nonzero) == 0:
+            return []
+
+        # novo trecho a cada salto de nível ou de amostra nula
+        values = self.h_num[nonzero]
+        jumps = (np.diff(nonzero) != 1) | ~np.isclose(values[1:], values[:-1])
+        starts = np.concatenate(([0], np.flatnonzero(jumps) + 1))
+        if len(starts) > MAX_PIECES:
+            return None
+
+        ends = np.concatenate((starts[1:], [len(nonzero)])) - 1
+        return [(values[a], self.s[nonzero[a]], self.s[nonzero[b]]) for a, b in zip(starts, ends)]
+
+    def window(self, t, s_lo=None, s_hi=None):
+        """
+        Slice (lo, hi) of the τ grid with s_lo <= t-τ <= s_hi, the support of h by default
+        """
+        s_lo = self.support[0] if s_lo is None else s_lo
+        s_hi = self.support[1] if s_hi is None else s_hi
+        lo = np.searchsorted(self.tau, t - s_hi, "left")
+        hi = np.searchsorted(self.tau, t - s_lo, "right")
+        return lo, max(lo, hi)
+
+    def h_shift(self, t, tau):
+        """
+        h(t-τ) at the given τ, interpolated from the samples of h
+        """
+        return np.interp(t - tau, self.s, self.h_num, left=0, right=0)
+
+    def integral(self, t):
+        """
+        y(t), from the given samples or over the window of t alone
+        """
+        if self.y_num is not None:
+            return np.interp(t, self.tau, self.y_num)
+
+        if self.pieces is not None:
+            # ∫ x em cada faixa em que h é constante, por somas prefixas
+            value = 0.0
+            for level, s_a, s_b in self.pieces:
+                lo, hi = self.window(t, s_a, s_b)
+                value += level * (self.prefix[hi] - self.prefix[lo])
+            return value
+
+        lo, hi = self.window(t)
+        return np.dot(self.x_num[lo:hi], self.h_shift(t, self.tau[lo:hi])) * self.dtau
+
+    def update_frame(self, t):
+        """
+        Move the window to t and refresh area, trace and readout
+        """
+        y = self.integral(t)
+        self.area.set_t(t)
+
+        if self.history_t and t < self.history_t[-1]:
+            # volta no tempo: descarta o trecho do traço à frente de t e refaz
+            while self.history_t and self.history_t[-1] > t:
+                self.history_t.pop()
+                self.history_y.pop()
+            self.history_t.append(t)
+            self.history_y.append(y)
+            ts, ys = np.asarray(self.history_t), np.asarray(self.history_y)
+            if len(ts) < 2:
+                ts, ys = np.repeat(ts, 2), np.repeat(ys, 2)
+            self.trace.set_points_as_corners(self.trace_point(ts, ys))
+        elif not self.history_t:
+            self.history_t.append(t)
+            self.history_y.append(y)
+            point = self.trace_point(np.array([t]), np.array([y]))
+            self.trace.set_points_as_corners(np.vstack([point, point]))
+        elif t > self.history_t[-1]:
+            # só o ponto novo entra no traço
+            self.history_t.append(t)
+            self.history_y.append(y)
+            self.trace.add_points_as_corners(self.trace_point(np.array([t]), np.array([y])))
+
+        if self.readout is not None:
+            self.readout.set_value(y)
+            end = self.trace_point(np.array([t]), np.array([y]))[0]
+            self.readout.next_to(end, UR, buff=0.1)
+
+        return self
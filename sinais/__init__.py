@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers of the signals and systems notebooks
+
+    sinais.signals      symdisp, round_expr, symplot, plotFunc
+    sinais.convolution  genConvGIF, flipShift
+    sinais._conv        convolve, convTime, convPiecewise (exported here)
+    sinais.circuits     responseRL/RC/RLC (symbolic, numeric and vectorized), YΔ, ΔY, par
+    sinais.render       genGIF
+    sinais.lambdacache  cachedLambdify, shared by all of the above
+    sinais.framewriter  ffmpeg streaming and parallel frame rendering
+
+Stages of genConvGIF/genGIF can be timed with sinais.profiling() or
+SINAIS_PROFILE=1 (see sinais.stageprofile).
+
+Importing the package (or any submodule) is cheap: numpy, sympy,
+matplotlib and IPython are only imported when a function needs them.
+
+    from sinais import genConvGIF, responseRLCser
+"""
+from .lazyimport import exports
+
+exports(
+    globals(),
+    symdisp=".signals:symdisp",
+    round_expr=".signals:round_expr",
+    symplot=".signals:symplot",
+    plotFunc=".signals:plotFunc",
+    genGIF=".render:genGIF",
+    flipShift=".convolution:flipShift",
+    genConvGIF=".convolution:genConvGIF",
+    convolve="._conv:convolve",
+    convTime="._conv:convTime",
+    convPiecewise="._conv:convPiecewise",
+    responseRL=".circuits:responseRL",
+    responseRC=".circuits:responseRC",
+    responseRLCpar=".circuits:responseRLCpar",
+    responseRLCser=".circuits:responseRLCser",
+    responseRLCser_num=".circuits:responseRLCser_num",
+    responseRL_vec=".circuits:responseRL_vec",
+    responseRC_vec=".circuits:responseRC_vec",
+    responseRLCpar_vec=".circuits:responseRLCpar_vec",
+    responseRLCser_vec=".circuits:responseRLCser_vec",
+    YΔ=".circuits:YΔ",
+    ΔY=".circuits:ΔY",
+    par=".circuits:par",
+    profiling=".stageprofile:profiling",
+)
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+from scipy.signal import fftconvolve, oaconvolve
+
+# abaixo deste tamanho a convolução direta ainda é a mais rápida
+DIRECT_MAX = 64
+# razão entre os comprimentos a partir da qual overlap-add compensa
+OA_RATIO = 16
+
+
+def chooseMethod(n, m):
+    """
+    Choose the fastest convolution method for signals of lengths n and m
+
+    :param n: length of the first signal [int]
+    :param m: length of the second signal [int]
+
+    :return: "direct", "fft" or "oa" (overlap-add) [string]
+    """
+    short, long = min(n, m), max(n, m)
+
+    if short <= DIRECT_MAX or short * long <= 4096:
+        return "direct"
+    elif long >= OA_RATIO * short:
+        return "oa"
+    else:
+        return "fft"
+
+
+def convolve(x, h, mode="full", method="auto"):
+    """
+    Discrete convolution of two sequences
+
+    :param x: first sequence [np array]
+    :param h: second sequence [np array]
+    :param mode: "full", "same" or "valid", as in np.convolve [string]
+    :param method: "auto", "direct", "fft" or "oa" (overlap-add) [string]
+
+    :return: convolution x*h [np array]
+    """
+    x = np.asarray(x)
+    h = np.asarray(h)
+
+    if method == "auto":
+        method = chooseMethod(len(x), len(h))
+
+    if method == "direct":
+        y = np.convolve(x, h, "full")
+    elif method == "fft":
+        y = fftconvolve(x, h, "full")
+    elif method == "oa":
+        y = oaconvolve(x, h, "full")
+    else:
+        raise ValueError(f"unknown convolution method: {method}")
+
+    n, m = len(x), len(h)
+    if mode == "full":
+        return y
+    elif mode == "same":
+        # mesmo recorte centralizado de np.convolve(x, h, "same")
+        start = (min(n, m) - 1) // 2
+        return y[start:start + max(n, m)]
+    elif mode == "valid":
+        return y[min(n, m) - 1:max(n, m)]
+    else:
+        raise ValueError(f"unknown convolution mode: {mode}")
+
+
+def convTime(h_num, x_num, totalTime, mode="same", method="auto"):
+    """
+    Continuous-time convolution y(t) of two signals sampled on totalTime
+
+    The samples of the full discrete convolution fall on the instants
+    2*totalTime[0] + n*dt. With mode="same" the result is realigned to
+    totalTime itself, so y[k] is y(totalTime[k]) for any grid origin.
+
+    :param h_num: h(t) sampled on totalTime [np array]
+    :param x_num: x(t) sampled on totalTime [np array]
+    :param totalTime: uniformly spaced time instants [np array]
+    :param mode: "full", "same" or "valid" [string]
+    :param method: "auto", "direct", "fft" or "oa" (overlap-add) [string]
+
+    :return y: convolution samples [np array]
+    :return ty: time instants of the samples in y [np array]
+    """
+    dt = totalTime[1] - totalTime[0]
+    N = len(totalTime)
+
+    y = convolve(h_num, x_num, "full", method) * dt
+    ty = 2 * totalTime[0] + np.arange(len(y)) * dt
+
+    if mode == "full":
+        return y, ty
+    elif mode == "same":
+        # y(totalTime[k]) está na amostra n = k - totalTime[0]/dt
+        shift = -totalTime[0] / dt
+        if np.isclose(shift, np.round(shift)):
+            start = int(np.round(shift))
+            y_same = np.zeros(N)
+            # trecho de y(t) que cai dentro de totalTime
+            lo, hi = max(start, 0), min(start + N, len(y))
+            if lo < hi:
+                y_same[lo - start:hi - start] = y[lo:hi]
+            return y_same, totalTime
+        return np.interp(totalTime, ty, y, left=0, right=0), totalTime
+    elif mode == "valid":
+        # só existe um instante em que h e x se sobrepõem por completo
+        return y[N - 1:N], ty[N - 1:N]
+    else:
+        raise ValueError(f"unknown convolution mode: {mode}")
+
+
+def _piecewiseToSteps(pw, t):
+    """
+    Rewrite a Piecewise of t with conditions t < a (or t <= a) as a sum of
+    windows u(t - a_{i-1}) - u(t - a_i)
+    """
+    result = 0
+    lower = None
+    for expr, cond in pw.args:
+        if cond == sp.true:
+            upper = None
+        elif isinstance(cond, (sp.StrictLessThan, sp.LessThan)) and cond.lhs == t:
+            upper = cond.rhs
+        elif isinstance(cond, (sp.StrictGreaterThan, sp.GreaterThan)) and cond.rhs == t:
+            upper = cond.lhs
+        else:
+            raise ValueError(f"unsupported Piecewise condition: {cond}")
+
+        window = 1 if lower is None else sp.Heaviside(t - lower)
+        if upper is not None:
+            window = window - sp.Heaviside(t - upper)
+        result += expr * window
+
+        if upper is None:
+            break
+        lower = upper
+
+    return result
+
+
+def stepTerms(f, t):
+    """
+    Decompose a right-sided signal as f(t) = sum_i g_i(t) u(t - a_i)
+
+    :param f: signal built from Heaviside/Piecewise [sympy expr]
+    :param t: time variable [sympy variable]
+
+    :return: list of pairs (g_i, a_i) [list]
+    """
+    f = f.replace(lambda e: isinstance(e, sp.Piecewise), lambda e: _piecewiseToSteps(e, t))
+
+    # u(a - t) = 1 - u(t - a)
+    def flip(e):
+        arg = e.args[0]
+        k = sp.diff(arg, t)
+        if k.is_number and k < 0:
+            return 1 - sp.Heaviside(t + arg.subs(t, 0) / k)
+        return e
+
+    f = f.replace(lambda e: isinstance(e, sp.Heaviside), flip)
+    f = sp.expand(f)
+
+    terms = []
+    for term in sp.Add.make_args(f):
+        start = None
+        rest = []
+        for fac in sp.Mul.make_args(term):
+            base, exp = fac.as_base_exp()
+            if isinstance(base, sp.Heaviside) and exp.is_Integer and exp > 0:
+                arg = base.args[0]
+                k = sp.diff(arg, t)
+                if not (k.is_number and k > 0 and sp.diff(k, t) == 0):
+                    raise ValueError(f"unsupported step: {base}")
+                a = -arg.subs(t, 0) / k
+                # u(t - a)u(t - b) = u(t - max(a, b))
+                start = a if start is None else sp.Max(start, a)
+            else:
+                rest.append(fac)
+
+        if start is None:
+            raise ValueError(f"term {term} is not right-sided")
+
+        terms.append((sp.Mul(*rest), start))
+
+    return terms
+
+
+@lru_cache(maxsize=None)
+def _pairConv(f, a, g, b, t):
+    """
+    Convolution of f(t)u(t - a) with g(t)u(t - b), valid for t >= a + b
+    """
+    tau = sp.Dummy("tau", real=True)
+    return sp.integrate(f.subs(t, tau) * g.subs(t, t - tau), (tau, a, t - b))
+
+
+def convPiecewise(x, h, t):
+    """
+    Closed-form convolution y(t) = x(t)*h(t) of right-sided signals
+
+    Both signals must be sums of terms g(t)u(t - a), with g integrable in
+    closed form (exponential-polynomials, as produced by Heaviside or simple
+    Piecewise definitions). The integral of each pair of terms is cached.
+
+    :param x: x(t) function [sympy expr]
+    :param h: h(t) function [sympy expr]
+    :param t: time variable [sympy variable]
+
+    :return: y(t) [sympy Piecewise]
+    """
+    pairs = [
+        (f, a, g, b)
+        for f, a in stepTerms(x, t)
+        for g, b in stepTerms(h, t)
+    ]
+    if not pairs:
+        return sp.Integer(0)
+
+    breaks = sorted({a + b for _, a, _, b in pairs}, key=float)
+
+    pieces = [(0, t < breaks[0])]
+    for k, c in enumerate(breaks):
+        y = sum(_pairConv(f, a, g, b, t) for f, a, g, b in pairs if float(a + b) <= float(c))
+        cond = t < breaks[k + 1] if k + 1 < len(breaks) else True
+        pieces.append((sp.simplify(y), cond))
+
+    return sp.Piecewise(*pieces)
+
@@ -0,0 +1,603 @@
+# -*- coding: utf-8 -*-
+from .lazyimport import lazy
+
+# par(), YΔ() e ΔY() não precisam de numpy nem sympy
+lazy(
+    globals(),
+    np="numpy",
+    sp="sympy",
+)
+
+
+def responseRL(i_t0, i_inf, t0, R, L):
+    """
+    Symbolically solves the transient response of an RL circuit
+
+    :param R: resistance.
+    :param L: inductance.
+    :param t0: initial time instant.
+    :param i_t0: inductor's current value at t0.
+    :param i_inf: inductor's current final value.
+    
+    :return iL(t): inductor's current.
+    :return vL(t): inductor's voltage.
+    :return τ: RL circuit time constant.
+    :return t: symbolic time variable.
+    
+    """
+    t = sp.symbols("t", real=True)
+    τ = L / R
+
+    iL = i_inf + (i_t0 - i_inf) * sp.exp(-t / τ)
+
+    vL = L * sp.diff(iL, t)
+
+    iL = iL.subs(t, sp.UnevaluatedExpr(t - t0))
+    vL = vL.subs(t, sp.UnevaluatedExpr(t - t0))
+
+    iL = sp.Piecewise((i_t0, t < t0), (iL, True))
+    vL = sp.Piecewise((0, t < t0), (vL, True))
+
+    return iL, vL, τ, t
+
+
+def responseRC(v_t0, v_inf, t0, R, C):
+    """
+    Symbolically solves the transient response of an RC circuit
+
+    :param R: resistance.
+    :param C: capacitance.
+    :param t0: initial time instant.
+    :param v_t0: capacitor's voltage value at t0.
+    :param v_inf: capacitor's voltage final value.
+    
+    :return vC(t): capacitor's voltage.
+    :return iC(t): capacitor's current.
+    :return τ: RC circuit time constant.
+    :return t: symbolic time variable.
+    
+    """
+    t = sp.symbols("t", real=True)
+    τ = R * C
+
+    vC = v_inf + (v_t0 - v_inf) * sp.exp(-t / τ)
+
+    iC = C * sp.diff(vC, t)
+
+    iC = iC.subs(t, sp.UnevaluatedExpr(t - t0))
+    vC = vC.subs(t, sp.UnevaluatedExpr(t - t0))
+
+    iC = sp.Piecewise((0, t < t0), (iC, True))
+    vC = sp.Piecewise((v_t0, t < t0), (vC, True))
+
+    return vC, iC, τ, t
+
+
+# soluções genéricas de y'' + 2αy' + ω0²y = ω0²y_inf, uma por tipo de resposta
+_rlcSolutions = {}
+
+
+def _rlcCacheFile():
+    import os
+
+    folder = os.environ.get(
+        "SINAIS_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "sinais-e-sistemas")
+    )
+    # v2: y'(t) simplificada antes de ir para o cache
+    return os.path.join(folder, f"rlc_solutions_v2_sympy{sp.__version__}.pkl")
+
+
+def _deriveRLCSolutions():
+    """
+    Symbolically solve the generic second-order transient once per type of
+    response, with the initial conditions as symbols
+
+    :return: {resp: (y(t), y'(t))} in terms of t, α, ω, y0, dy0, y_inf [dict]
+    """
+    t = sp.symbols("t", real=True)
+    α, ω, y0, dy0, y_inf = sp.symbols("alpha, omega, y0, dy0, y_inf", real=True)
+    K1, K2 = sp.symbols("K1, K2")
+
+    # ω é sqrt(α² - ω0²) na superamortecida e sqrt(ω0² - α²) na subamortecida
+    forms = {
+        "resp. superamortecida": K1 * sp.exp((-α + ω) * t) + K2 * sp.exp((-α - ω) * t),
+        "resp. subamortecida": sp.exp(-α * t) * (K1 * sp.cos(ω * t) + K2 * sp.sin(ω * t)),
+        "resp. critic. amortecida": (K1 + K2 * t) * sp.exp(-α * t),
+    }
+
+    solutions = {}
+    for resp, y in forms.items():
+        y = y + y_inf
+        dy = sp.diff(y, t)
+
+        # define os sistema de equações com as condições iniciais
+        eqs = (sp.Eq(y.subs(t, 0), y0), sp.Eq(dy.subs(t, 0), dy0))
+        soluc = sp.solve(eqs, (K1, K2), dict=True)[0]
+        soluc = {K: sp.simplify(value) for K, value in soluc.items()}
+
+        # y'(t) simplificada uma única vez: é ela que os alunos veem em iL/vC
+        y = y.subs(soluc)
+        dy = sp.collect(sp.simplify(dy.subs(soluc)), sp.exp(-α * t), evaluate=True)
+        solutions[resp] = (y, dy)
+
+    return solutions
+
+
+def _rlcSolution(resp):
+    """
+    Generic solution for a type of response, derived once and cached in
+    memory and on disk (SINAIS_CACHE_DIR, ~/.cache/sinais-e-sistemas by default)
+    """
+    if not _rlcSolutions:
+        import os
+        import pickle
+
+        path = _rlcCacheFile()
+        try:
+            with open(path, "rb") as f:
+                _rlcSolutions.update(pickle.load(f))
+        except (OSError, pickle.UnpicklingError, EOFError):
+            _rlcSolutions.update(_deriveRLCSolutions())
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = path + f".{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    pickle.dump(dict(_rlcSolutions), f)
+                os.replace(tmp, path)
+            except OSError:
+                pass  # sem disco, fica só o cache em memória
+
+    return _rlcSolutions[resp]
+
+
+def _collectExp(expr):
+    """
+    Numeric response as a sum of exponentials times polynomials/sinusoids
+    """
+    return sp.collect(sp.expand(expr), sorted(expr.atoms(sp.exp), key=sp.default_sort_key))
+
+
+def _rlcResponse(resp, α, ω0, y0, dy0, y_inf, scale=1):
+    """
+    y(t) and scale*y'(t) of a second-order circuit by substitution of
+    numbers in the cached generic solution
+    """
+    if resp == "resp. superamortecida":
+        ω = np.sqrt(α ** 2 - ω0 ** 2)
+    elif resp == "resp. subamortecida":
+        ω = np.sqrt(ω0 ** 2 - α ** 2)
+    else:
+        ω = 0
+
+    y, dy = _rlcSolution(resp)
+    values = dict(zip(
+        sp.symbols("alpha, omega, y0, dy0, y_inf", real=True),
+        map(sp.sympify, (α, ω, y0, dy0, y_inf)),
+    ))
+
+    return _collectExp(y.xreplace(values)), _collectExp(scale * dy.xreplace(values))
+
+
+def responseRLCpar(vC_t0, iL_t0, iL_inf, t0, R, L, C):
+    """
+    Symbolically solves the transient response of a parallel RLC circuit
+
+    :param R: resistance.
+    :param L: inductance.
+    :param C: capacitance.
+    :param t0: initial time instant.
+    :param vC_t0: capacitor's voltage value at t0.
+    :param iL_t0: inductor's current value at t0.
+    :param i_inf: inductor's current final value.
+    
+    :return α: Neper's frequency.
+    :return ω0: resonant frequency.
+    :return iL(t): inductor's current.
+    :return vC(t): capacitor's voltage.
+    :return resp.: type of response.
+    
+    """
+    α = 1 / (2 * R * C)
+    ω0 = 1 / np.sqrt(L * C)
+
+    t = sp.symbols("t", real=True)
+
+    if np.isclose(α, ω0, rtol=1e-05, atol=1e-4):
+        resp = "resp. critic. amortecida"
+    elif α > ω0:
+        resp = "resp. superamortecida"
+    else:
+        resp = "resp. subamortecida"
+
+    iL, vC = _rlcResponse(resp, α, ω0, iL_t0, vC_t0 / L, iL_inf, L)
+
+    iL = iL.subs(t, sp.UnevaluatedExpr(t - t0))
+    vC = vC.subs(t, sp.UnevaluatedExpr(t - t0))
+
+    iL = sp.Piecewise((iL_t0, t < t0), (iL, True))
+    vC = sp.Piecewise((vC_t0, t < t0), (vC, True))
+
+    return α, ω0, iL, vC, resp, t
+
+
+def responseRLCser(vC_t0, iL_t0, vC_inf, t0, R, L, C):
+    """
+    Symbolically solves the transient response of a series RLC circuit
+
+    :param R: resistance.
+    :param L: inductance.
+    :param C: capacitance.
+    :param t0: initial time instant.
+    :param vC_t0: capacitor's voltage value at t0.
+    :param iL_t0: inductor's current value at t0.
+    :param vC_inf: capacitor's voltage final value.
+    
+    :return vC(t): capacitor's voltage.
+    :return iL(t): inductor's current.
+    :return resp.: type of response. 
+    :return α: Neper's frequency.
+    :return ω0: resonant frequency.
+    
+    """
+    α = R / (2 * L)
+    ω0 = 1 / np.sqrt(L * C)
+
+    t = sp.symbols("t", real=True)
+
+    if np.isclose(α, ω0, rtol=1e-05, atol=1e-4):
+        resp = "resp. critic. amortecida"
+    elif α > ω0:
+        resp = "resp. superamortecida"
+    else:
+        resp = "resp. subamortecida"
+
+    vC, iL = _rlcResponse(resp, α, ω0, vC_t0, iL_t0 / C, vC_inf, C)
+
+    iL = iL.subs(t, sp.UnevaluatedExpr(t - t0))
+    vC = vC.subs(t, sp.UnevaluatedExpr(t - t0))
+
+    iL = sp.Piecewise((iL_t0, t < t0), (iL, True))
+    vC = sp.Piecewise((vC_t0, t < t0), (vC, True))
+
+    return α, ω0, iL, vC, resp, t
+
+
+def responseRLCser_num(R, L, C, vC_t0, iL_t0, Vs, t, method="foh"):
+    """
+    Numerically solves the transient response of a series RLC circuit
+
+    :param R: resistance.
+    :param L: inductance.
+    :param C: capacitance.
+    :param vC_t0: capacitor's voltage value at t0.
+    :param iL_t0: inductor's current value at t0.
+    :param Vs: numpy array with the voltage source amplitude from t0 to t_final.
+    :param t: numpy array with time values from t0 to t_final.
+    :param method: "foh" (exact for Vs linear between samples, second order otherwise),
+                   "zoh" (exact for Vs held constant between samples, first order otherwise),
+                   "rk4" (Runge-Kutta, Vs linear between samples, any time grid) or "euler".
+                   foh and zoh need a uniform grid and fall back to rk4 otherwise.
+
+    :return i(t):  numpy array with the circuit's current.
+    :return vR(t): numpy array with the resistor's voltage.
+    :return vL(t): numpy array with the inductor's voltage.
+    :return vC(t): numpy array with the capacitor's voltage.
+        
+    """
+
+    # EDO da tensão sobre o capacitor: vc''(t)+(R/L)vc'(t)+vc(t)/LC = vs(t)/LC
+    # estados: vc(t) e x(t) = vc'(t)
+    A = np.array([[0, 1], [-1 / (L * C), -R / L]])
+    B = np.array([0, 1 / (L * C)])
+    s0 = np.array([vC_t0, iL_t0 / C])
+
+    steps = np.diff(t)
+    if method in ("zoh", "foh") and not np.allclose(steps, steps[0]):
+        method = "rk4"  # a discretização exata exige passo constante
+
+    if method in ("zoh", "foh"):
+        vC, x = _rlcHold(A, B, s0, Vs, steps[0], method == "foh")
+        i = C * x
+    elif method == "rk4":
+        vC, x = _rlcRK4(A, B, s0, Vs, t)
+        i = C * x
+    elif method == "euler":
+        vC = np.zeros(t.shape)
+        x = np.zeros(t.shape)
+
+        # Solução numérica:
+        vC[0] = vC_t0  # condição incial de vc
+        x[0] = iL_t0 / C  # condição inicial da derivada vc'(t)
+
+        # Integração numérica via método de Euler:
+        deltaT = t[1] - t[0]  # passo de integração
+
+        for kk in range(len(t) - 1):
+            vC[kk + 1] = vC[kk] + x[kk] * deltaT  # calcula vc(t+deltaT)
+            x[kk + 1] = (
+                x[kk] + (-R / L * x[kk] - 1 / (L * C) * (vC[kk] - Vs[kk])) * deltaT
+            )  # calcula vc'(t+deltaT)
+
+        i = np.append(iL_t0, C * np.diff(vC) / np.diff(t))  # corrente no circuito
+    else:
+        raise ValueError(f"unknown method: {method}")
+
+    # cálculo das tensões a partir de vc(t) e i(t):
+    vR = R * i  # tensão sobre o resistor
+    vL = Vs - vR - vC  # tensão sobre o indutor(LKT)
+
+    return i, vR, vL, vC
+
+
+def _rlcHold(A, B, s0, Vs, deltaT, linear=False):
+    """
+    Discretization of s' = As + B vs, run as two second-order IIR filters
+
+    Exact when vs is held constant between samples (zero-order hold) or,
+    with linear=True, when vs varies linearly between them (first-order hold).
+    """
+    from scipy.linalg import expm
+    from scipy.signal import lfilter, ss2tf
+
+    # exp([[A, B, 0], [0, 0, 1], [0, 0, 0]]*T) = [[Ad, Γ1, Γ2], [0, 1, T], [0, 0, 1]]
+    # com Γ1 = ∫ e^{As} B ds e Γ2 = ∫ e^{A(T-s)} B s ds, ambas de 0 a T
+    M = np.zeros((4, 4))
+    M[:2, :2] = A
+    M[:2, 2] = B
+    M[2, 3] = 1
+    E = expm(M * deltaT)
+    Ad, G1, G2 = E[:2, :2], E[:2, 2:3], E[:2, 3:4]
+
+    if linear:
+        # s[k+1] = Ad s[k] + (Γ1 - Γ2/T) vs[k] + Γ2/T vs[k+1]; com
+        # z = s - Γ2/T vs o termo em vs[k+1] some e sobra a saída direta Γ2/T vs
+        D = G2 / deltaT
+        Bd = Ad @ D + G1 - D
+        z0 = s0 - D[:, 0] * Vs[0]
+    else:
+        D = np.zeros((2, 1))
+        Bd = G1
+        z0 = s0
+
+    out = []
+    for Cd in ([[1, 0]], [[0, 1]]):
+        num, den = ss2tf(Ad, Bd, Cd, np.array(Cd) @ D)
+        num = num[0]
+
+        # condição inicial do filtro que reproduz Cd Ad^k z0 sem entrada
+        y0 = Cd[0] @ z0
+        y1 = Cd[0] @ Ad @ z0
+        zi = np.array([y0, y1 + den[1] * y0])
+
+        y, _ = lfilter(num, den, Vs, zi=zi)
+        out.append(y)
+
+    return out
+
+
+def _rlcRK4(A, B, s0, Vs, t):
+    """
+    Classic fourth-order Runge-Kutta for s' = As + B vs, with vs linearly
+    interpolated between samples
+    """
+    a21, a22 = A[1]
+    b2 = B[1]
+    vC = np.zeros(t.shape)
+    x = np.zeros(t.shape)
+    vC[0], x[0] = s0
+
+    # A = [[0, 1], [a21, a22]] e B = [0, b2]: derivadas escritas por extenso
+    def f(v, dv, vs):
+        return dv, a21 * v + a22 * dv + b2 * vs
+
+    v, dv = float(vC[0]), float(x[0])
+    for kk in range(len(t) - 1):
+        h = float(t[kk + 1] - t[kk])
+        v0, v1 = float(Vs[kk]), float(Vs[kk + 1])
+        vm = (v0 + v1) / 2
+
+        k1v, k1x = f(v, dv, v0)
+        k2v, k2x = f(v + h / 2 * k1v, dv + h / 2 * k1x, vm)
+        k3v, k3x = f(v + h / 2 * k2v, dv + h / 2 * k2x, vm)
+        k4v, k4x = f(v + h * k3v, dv + h * k3x, v1)
+
+        v += h / 6 * (k1v + 2 * k2v + 2 * k3v + k4v)
+        dv += h / 6 * (k1x + 2 * k2x + 2 * k3x + k4x)
+        vC[kk + 1], x[kk + 1] = v, dv
+
+    return vC, x
+
+
+def _sweepArrays(*params):
+    """
+    Broadcast scalar or array parameters to 1-D float arrays of equal length
+    """
+    return [np.ravel(p).astype(float) for p in np.broadcast_arrays(*params)]
+
+
+def responseRL_vec(i_t0, i_inf, t0, R, L, t):
+    """
+    Vectorized transient response of RL circuits for arrays of parameters
+
+    :param i_t0: inductor's current value at t0 [scalar or np array].
+    :param i_inf: inductor's current final value [scalar or np array].
+    :param t0: initial time instant [scalar or np array].
+    :param R: resistance [scalar or np array].
+    :param L: inductance [scalar or np array].
+    :param t: numpy array with time values.
+
+    :return iL(t): inductor's current, shape (n_params, n_times).
+    :return vL(t): inductor's voltage, shape (n_params, n_times).
+    :return τ: RL circuit time constants.
+    """
+    i_t0, i_inf, t0, R, L = _sweepArrays(i_t0, i_inf, t0, R, L)
+    τ = L / R
+
+    T = np.asarray(t, dtype=float)[None, :] - t0[:, None]
+    e = np.exp(-np.maximum(T, 0) / τ[:, None])
+
+    iL = i_inf[:, None] + (i_t0 - i_inf)[:, None] * e
+    vL = -(R * (i_t0 - i_inf))[:, None] * e
+
+    iL = np.where(T < 0, i_t0[:, None], iL)
+    vL = np.where(T < 0, 0.0, vL)
+
+    return iL, vL, τ
+
+
+def responseRC_vec(v_t0, v_inf, t0, R, C, t):
+    """
+    Vectorized transient response of RC circuits for arrays of parameters
+
+    :param v_t0: capacitor's voltage value at t0 [scalar or np array].
+    :param v_inf: capacitor's voltage final value [scalar or np array].
+    :param t0: initial time instant [scalar or np array].
+    :param R: resistance [scalar or np array].
+    :param C: capacitance [scalar or np array].
+    :param t: numpy array with time values.
+
+    :return vC(t): capacitor's voltage, shape (n_params, n_times).
+    :return iC(t): capacitor's current, shape (n_params, n_times).
+    :return τ: RC circuit time constants.
+    """
+    v_t0, v_inf, t0, R, C = _sweepArrays(v_t0, v_inf, t0, R, C)
+    τ = R * C
+
+    T = np.asarray(t, dtype=float)[None, :] - t0[:, None]
+    e = np.exp(-np.maximum(T, 0) / τ[:, None])
+
+    vC = v_inf[:, None] + (v_t0 - v_inf)[:, None] * e
+    iC = -((v_t0 - v_inf) / R)[:, None] * e
+
+    vC = np.where(T < 0, v_t0[:, None], vC)
+    iC = np.where(T < 0, 0.0, iC)
+
+    return vC, iC, τ
+
+
+def _secondOrder_vec(α, ω0, y0, dy0, y_inf, t0, t):
+    """
+    y(t) and y'(t) of y'' + 2αy' + ω0²y = ω0²y_inf for arrays of parameters
+
+    :return y, dy: arrays of shape (n_params, n_times).
+    :return resp: type of response of each parameter set.
+    """
+    crit = np.isclose(α, ω0, rtol=1e-05, atol=1e-4)
+    over = ~crit & (α > ω0)
+    resp = np.where(
+        crit,
+        "resp. critic. amortecida",
+        np.where(over, "resp. superamortecida", "resp. subamortecida"),
+    )
+
+    T = np.asarray(t, dtype=float)[None, :] - t0[:, None]
+    Tp = np.maximum(T, 0)
+    D = y0 - y_inf
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # raízes distintas (complexas na resposta subamortecida)
+        disc = np.sqrt((α ** 2 - ω0 ** 2).astype(complex))
+        s1 = -α + disc
+        s2 = -α - disc
+        A1 = (dy0 - s2 * D) / (s1 - s2)
+        A2 = D - A1
+        e1 = np.exp(s1[:, None] * Tp)
+        e2 = np.exp(s2[:, None] * Tp)
+        y_d = (A1[:, None] * e1 + A2[:, None] * e2).real
+        dy_d = (A1[:, None] * s1[:, None] * e1 + A2[:, None] * s2[:, None] * e2).real
+
+        # raiz dupla
+        D2 = dy0 + α * D
+        ea = np.exp(-α[:, None] * Tp)
+        y_c = (D[:, None] + D2[:, None] * Tp) * ea
+        dy_c = (D2[:, None] - α[:, None] * (D[:, None] + D2[:, None] * Tp)) * ea
+
+    y = np.where(crit[:, None], y_c, y_d) + y_inf[:, None]
+    dy = np.where(crit[:, None], dy_c, dy_d)
+
+    y = np.where(T < 0, y0[:, None], y)
+    dy = np.where(T < 0, dy0[:, None], dy)
+
+    return y, dy, resp
+
+
+def responseRLCpar_vec(vC_t0, iL_t0, iL_inf, t0, R, L, C, t):
+    """
+    Vectorized transient response of parallel RLC circuits for arrays of parameters
+
+    :param vC_t0: capacitor's voltage value at t0 [scalar or np array].
+    :param iL_t0: inductor's current value at t0 [scalar or np array].
+    :param iL_inf: inductor's current final value [scalar or np array].
+    :param t0: initial time instant [scalar or np array].
+    :param R: resistance [scalar or np array].
+    :param L: inductance [scalar or np array].
+    :param C: capacitance [scalar or np array].
+    :param t: numpy array with time values.
+
+    :return α: Neper's frequencies.
+    :return ω0: resonant frequencies.
+    :return iL(t): inductor's current, shape (n_params, n_times).
+    :return vC(t): capacitor's voltage, shape (n_params, n_times).
+    :return resp.: type of response of each parameter set.
+    """
+    vC_t0, iL_t0, iL_inf, t0, R, L, C = _sweepArrays(vC_t0, iL_t0, iL_inf, t0, R, L, C)
+    α = 1 / (2 * R * C)
+    ω0 = 1 / np.sqrt(L * C)
+
+    iL, diL, resp = _secondOrder_vec(α, ω0, iL_t0, vC_t0 / L, iL_inf, t0, t)
+    vC = L[:, None] * diL
+
+    return α, ω0, iL, vC, resp
+
+
+def responseRLCser_vec(vC_t0, iL_t0, vC_inf, t0, R, L, C, t):
+    """
+    Vectorized transient response of series RLC circuits for arrays of parameters
+
+    :param vC_t0: capacitor's voltage value at t0 [scalar or np array].
+    :param iL_t0: inductor's current value at t0 [scalar or np array].
+    :param vC_inf: capacitor's voltage final value [scalar or np array].
+    :param t0: initial time instant [scalar or np array].
+    :param R: resistance [scalar or np array].
+    :param L: inductance [scalar or np array].
+    :param C: capacitance [scalar or np array].
+    :param t: numpy array with time values.
+
+    :return α: Neper's frequencies.
+    :return ω0: resonant frequencies.
+    :return iL(t): inductor's current, shape (n_params, n_times).
+    :return vC(t): capacitor's voltage, shape (n_params, n_times).
+    :return resp.: type of response of each parameter set.
+    """
+    vC_t0, iL_t0, vC_inf, t0, R, L, C = _sweepArrays(vC_t0, iL_t0, vC_inf, t0, R, L, C)
+    α = R / (2 * L)
+    ω0 = 1 / np.sqrt(L * C)
+
+    vC, dvC, resp = _secondOrder_vec(α, ω0, vC_t0, iL_t0 / C, vC_inf, t0, t)
+    iL = C[:, None] * dvC
+
+    return α, ω0, iL, vC, resp
+
+
+def YΔ(R1, R2, R3):
+
+    x = R1 * R2 + R2 * R3 + R3 * R1
+    Ra = x / R1
+    Rb = x / R2
+    Rc = x / R3
+
+    return Ra, Rb, Rc
+
+
+def ΔY(Ra, Rb, Rc):
+
+    x = Ra + Rb + Rc
+    R1 = (Rb * Rc) / x
+    R2 = (Ra * Rc) / x
+    R3 = (Rb * Ra) / x
+
+    return R1, R2, R3
+
+def par(*R):
+    r = sum(1/u for u in R)
+    return 1/r
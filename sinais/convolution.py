@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+from .lazyimport import lazy
+from .signals import symplot
+from .stageprofile import profileFigure, stage
+
+lazy(
+    globals(),
+    np="numpy",
+    plt="matplotlib.pyplot",
+    FuncAnimation="matplotlib.animation:FuncAnimation",
+    convolve="._conv:convolve",
+    convTime="._conv:convTime",
+    convPiecewise="._conv:convPiecewise",
+    cachedLambdify=".lambdacache:cachedLambdify",
+    ConvFrames=".framewriter:ConvFrames",
+    renderParallel=".framewriter:renderParallel",
+    streamFrames=".framewriter:streamFrames",
+)
+
+
+class _FlipShift:
+    """
+    x(totalTime[a] - totalTime) from samples of x on a grid covering every t-τ
+
+    A plain object instead of a closure so that it can be sent, buffer and
+    all, to the worker processes of renderParallel.
+    """
+
+    def __init__(self, totalTime, grid, buffer, uniform):
+        self.totalTime = totalTime
+        self.grid = grid
+        self.buffer = buffer
+        self.uniform = uniform
+
+    def __call__(self, a):
+        if self.uniform:
+            return self.buffer[a:a + len(self.totalTime)][::-1]
+        return np.interp(self.totalTime[a] - self.totalTime, self.grid, self.buffer)
+
+
+def flipShift(x_func, totalTime):
+    """
+    Precompute x(t-τ) for every delay t taken from totalTime
+
+    x is evaluated only once, on a grid that covers every possible value of
+    t-τ. Each shifted and flipped copy is then a reversed slice of that buffer
+    (uniform grids) or an interpolation into it (non-uniform grids).
+
+    :param x_func: numerical function x(t) [callable]
+    :param totalTime: array of time instants τ where x(t-τ) will be evaluated [nparray]
+
+    :return: picklable function of the delay index a returning x(totalTime[a] - totalTime) [callable]
+    """
+    N = len(totalTime)
+    steps = np.diff(totalTime)
+    dt = steps[0]
+    uniform = np.allclose(steps, dt)
+
+    if uniform:
+        # t-τ = (a - k)*dt, com a - k entre -(N-1) e N-1
+        grid = np.arange(-(N - 1), N) * dt
+    else:
+        span = totalTime.max() - totalTime.min()
+        nPoints = int(np.ceil(2 * span / np.min(np.abs(steps)))) + 1
+        grid = np.linspace(-span, span, nPoints)
+
+    # cópia contígua: um broadcast de escalar não sobrevive bem ao pickle
+    buffer = np.array(np.broadcast_to(np.asarray(x_func(grid), dtype=float), grid.shape))
+    return _FlipShift(totalTime, grid, buffer, uniform)
+
+def genConvGIF(
+    x,
+    h,
+    t,
+    totalTime,
+    ti,
+    tf,
+    figName,
+    xlabel=[],
+    ylabel=[],
+    fram=200,
+    inter=20,
+    plotConv=False,
+    colors=['blue', 'orange', 'green'],
+    figsize=(8, 6),
+    enable_legend = False,
+    xlim = None,
+    ylim = None,
+    precompute = True,
+    method = "auto",
+    writer = "imagemagick",
+    codec = None,
+    workers = 1
+):
+    """
+    Create and save a convolution plot animation as GIF
+
+    :param x: x(t) function [sympy expr]
+    :param h: h(t) function [sympy expr]
+    :param t: t time variable [sympy variable]
+    :param totalTime: array of time instants where the functions will be evaluated [nparray]
+    :param ti: time when animation starts [scalar]
+    :param tf: time when animation stops [scalar]
+    :param figName: figure file name w/ folder path [string]
+    :param xlabel: xlabel [string]
+    :param ylabel: ylabel [string]
+    :param fram: number of frames [int]
+    :param inter: time interval between frames [milliseconds]
+    :param colors: colors for the plots [list of strings]
+    :param figsize: figure size (width, height) [tuple]
+    :param writer: "imagemagick" (matplotlib writer) or "ffmpeg" (streamed raw frames) [string]
+    :param codec: ffmpeg codec when writer="ffmpeg", None picks it from figName's extension [string]
+    :param workers: render frames on this many processes. With workers > 1 the frames are
+                    always streamed to ffmpeg (writer is ignored, codec is used) and x(t-τ)
+                    always comes from the flipShift buffer: precompute=False is an error [int]
+    :param precompute: evaluate x(t) once and get every x(t-τ) by indexing a shared buffer [bool]
+    :param method: convolution method: "auto", "direct", "fft", "oa" (overlap-add) or "analytic" [string]
+    """
+    if workers > 1 and not precompute:
+        raise ValueError("workers > 1 needs precompute=True: x(t-τ) can't be substituted symbolically in the workers")
+
+    with stage("lambdify"):
+        x_func = cachedLambdify(t, x)
+        h_func = cachedLambdify(t, h)
+
+    with stage("evaluate"):
+        x_num = x_func(totalTime)
+        h_num = h_func(totalTime)
+
+    if plotConv:
+        with stage("convolution", method=method):
+            if method == "analytic":
+                y_func = cachedLambdify(t, convPiecewise(x, h, t))
+                y_num = np.broadcast_to(y_func(totalTime), totalTime.shape)
+            else:
+                y_num, _ = convTime(h_num, x_num, totalTime, "same", method)
+        ymax = np.max([x_num, h_num, y_num])
+        ymin = np.min([x_num, h_num, y_num])
+    else:
+        ymax = np.max([x_num, h_num])
+        ymin = np.min([x_num, h_num])
+
+    figAnim = plt.figure(figsize=figsize)  # Adjust figsize here
+    ax = plt.axes()
+        # Aplicando xlim e ylim se fornecidos
+    if xlim is not None:
+        ax.set_xlim(xlim)
+    else:
+        ax.set_xlim(totalTime.min(), totalTime.max())
+
+    if ylim is not None:
+        ax.set_ylim(ylim)
+    else:
+        ax.set_ylim(ymin - 0.1 * np.abs(ymax), ymax + 0.1 * np.abs(ymax))
+
+        
+    line1, line2, line3 = ax.plot([], [], [], [], [], [])
+    line1.set_label(ylabel[0])
+    line2.set_label(ylabel[1])
+
+    if plotConv:
+        line3.set_label(ylabel[2])
+
+    ax.grid()
+    
+    if enable_legend:
+        ax.legend(loc="upper right")
+
+
+    # plot static function
+    if precompute:
+        figh = None
+    else:
+        figh = symplot(t, h, totalTime, "h(t)", colors[0])
+
+    if len(xlabel):
+        plt.xlabel(xlabel)
+
+    def init():
+        if precompute:
+            line1.set_data(totalTime, h_num)
+        else:
+            line1.set_data(figh.get_axes()[0].lines[0].get_data())
+        line1.set_color(colors[0])
+        return (line1,)
+
+    if figh is not None:
+        plt.close(figh)
+
+    delays = totalTime[:: int(len(totalTime) / fram)]
+    ind = np.arange(0, len(totalTime), int(len(totalTime) / fram))
+
+    ind = ind[delays > ti]
+    delays = delays[delays > ti]
+
+    ind = ind[delays < tf]
+    delays = delays[delays < tf]
+
+    totalFrames = len(delays)
+
+    if precompute:
+        with stage("shift"):
+            x_shift = flipShift(x_func, totalTime)
+
+    if workers > 1:
+        # cada processo monta a própria figura e desloca x a partir do mesmo buffer
+        frames = ConvFrames(
+            totalTime,
+            h_num,
+            x_shift,
+            y_num if plotConv else None,
+            ind,
+            colors,
+            ylabel,
+            xlabel,
+            figsize,
+            ax.get_xlim(),
+            ax.get_ylim(),
+            enable_legend,
+        )
+        plt.close(figAnim)
+        renderParallel(frames, range(totalFrames), figName, fps=1000 / inter, dpi=200, codec=codec, workers=workers)
+        return
+
+    def animate(i):
+        with stage("animate", frame=i):
+            if precompute:
+                line2.set_data(totalTime, x_shift(ind[i]))
+            else:
+                with stage("subs", frame=i):
+                    x_i = x.subs({t: delays[i] - t})
+                figx = symplot(t, x_i, totalTime, "x(t-τ)",colors[1])
+                line2.set_data(figx.get_axes()[0].lines[0].get_data())
+                plt.close(figx)
+            line2.set_color(colors[1])
+            if plotConv:
+                line3.set_data(totalTime[:ind[i]], y_num[:ind[i]])
+                line3.set_color(colors[2])
+        return line2, line3
+
+    if writer == "ffmpeg":
+        with stage("tight_layout"):
+            plt.tight_layout()
+        streamFrames(figAnim, animate, range(totalFrames), figName, fps=1000 / inter, dpi=200, codec=codec, init=init)
+        plt.close()
+        return
+
+    anim = FuncAnimation(
+        figAnim,
+        animate,
+        init_func=init,
+        frames=totalFrames,
+        interval=inter,
+        blit=True,
+    )
+    with stage("tight_layout"):
+        plt.tight_layout()
+    # o desenho de cada quadro acontece dentro do matplotlib
+    profileFigure(figAnim)
+    with stage("save", writer=writer):
+        anim.save(figName, dpi=200, writer=writer)
+    plt.close()
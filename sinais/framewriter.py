@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+
+import numpy as np
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from .stageprofile import stage
+
+# codec padrão para cada extensão de arquivo
+CODECS = {
+    ".gif": "gif",
+    ".mp4": "libx264",
+    ".mkv": "libx264",
+    ".mov": "libx264",
+    ".webm": "libvpx-vp9",
+}
+
+
+def ffmpegCommand(width, height, fps, figName, codec=None):
+    """
+    ffmpeg command line that reads raw RGB frames from stdin
+
+    :param width: frame width [pixels]
+    :param height: frame height [pixels]
+    :param fps: frames per second [float]
+    :param figName: output file name w/ folder path [string]
+    :param codec: "gif", "libx264", ... (None picks it from the file extension) [string]
+
+    :return: command line [list of strings]
+    """
+    if codec is None:
+        ext = os.path.splitext(figName)[1].lower()
+        codec = CODECS.get(ext, "libx264")
+
+    cmd = [
+        matplotlib.rcParams["animation.ffmpeg_path"],
+        "-y",
+        "-loglevel", "error",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}",
+        "-r", f"{fps}",
+        "-i", "-",
+    ]
+
+    if codec == "gif":
+        # uma paleta por quadro: o ffmpeg não precisa guardar o vídeo inteiro
+        cmd += [
+            "-filter_complex",
+            "split[a][b];[a]palettegen=stats_mode=single[p];[b][p]paletteuse=new=1",
+        ]
+    else:
+        # yuv420p exige largura e altura pares
+        cmd += [
+            "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2",
+            "-c:v", codec,
+            "-pix_fmt", "yuv420p",
+        ]
+
+    return cmd + [figName]
+
+
+def streamFrames(fig, animate, frames, figName, fps=50, dpi=200, codec=None, init=None):
+    """
+    Render an animation straight into an ffmpeg pipe
+
+    Each frame is drawn on an Agg canvas and written as raw RGB to ffmpeg,
+    so only one frame is held in memory at a time.
+
+    :param fig: matplotlib figure to be animated
+    :param animate: function that updates the figure for frame i [callable]
+    :param frames: frame indexes passed to animate [iterable]
+    :param figName: output file name w/ folder path (.gif, .mp4, ...) [string]
+    :param fps: frames per second [float]
+    :param dpi: resolution of the rendered frames [int]
+    :param codec: "gif", "libx264", ... (None picks it from the file extension) [string]
+    :param init: function called once before the first frame [callable]
+    """
+    fig.set_dpi(dpi)
+    canvas = FigureCanvasAgg(fig)
+
+    if init is not None:
+        init()
+
+    proc = None
+    try:
+        for i in frames:
+            with stage("frame", frame=i):
+                animate(i)
+                with stage("draw", frame=i):
+                    canvas.draw()
+                frame = np.asarray(canvas.buffer_rgba())[:, :, :3]
+
+                if proc is None:
+                    height, width = frame.shape[:2]
+                    cmd = ffmpegCommand(width, height, fps, figName, codec)
+                    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+                # inclui a espera pelo ffmpeg quando ele é mais lento
+                with stage("encode", frame=i):
+                    proc.stdin.write(frame.tobytes())
+    except BaseException:
+        if proc is not None:
+            proc.kill()
+        raise
+
+    if proc is not None:
+        proc.stdin.close()
+        with stage("ffmpeg finish"):
+            status = proc.wait()
+        if status != 0:
+            raise RuntimeError(f"ffmpeg failed writing {figName}")
+
+
+class ConvFrames:
+    """
+    Picklable description of the genConvGIF figure
+
+    Calling it builds a new Agg figure (no pyplot) and returns it with the
+    function that draws frame i, so each worker process can render frames
+    on its own canvas.
+
+    :param totalTime: array of time instants τ [nparray]
+    :param h_num: h(τ) samples [nparray]
+    :param x_shift: picklable function of the delay index returning x(t-τ), e.g. flipShift [callable]
+    :param y_num: y(t) samples or None [nparray]
+    :param ind: index in totalTime of the delay of each frame [nparray]
+    :param colors: colors for h, x and y [list of strings]
+    :param labels: legend labels for h, x and y [list of strings]
+    :param xlabel: xlabel [string]
+    :param figsize: figure size (width, height) [tuple]
+    :param xlim: x-axis limits [tuple]
+    :param ylim: y-axis limits [tuple]
+    :param legend: show the legend [bool]
+    """
+
+    def __init__(self, totalTime, h_num, x_shift, y_num, ind, colors, labels,
+                 xlabel, figsize, xlim, ylim, legend):
+        self.totalTime = totalTime
+        self.h_num = h_num
+        self.x_shift = x_shift
+        self.y_num = y_num
+        self.ind = ind
+        self.colors = colors
+        self.labels = labels
+        self.xlabel = xlabel
+        self.figsize = figsize
+        self.xlim = xlim
+        self.ylim = ylim
+        self.legend = legend
+
+    def __call__(self):
+        from matplotlib.figure import Figure
+
+        fig = Figure(figsize=self.figsize)
+        ax = fig.add_subplot()
+        ax.set_xlim(self.xlim)
+        ax.set_ylim(self.ylim)
+
+        line1, line2, line3 = ax.plot([], [], [], [], [], [])
+        line1.set_label(self.labels[0])
+        line2.set_label(self.labels[1])
+        if self.y_num is not None:
+            line3.set_label(self.labels[2])
+
+        ax.grid()
+        if self.legend:
+            ax.legend(loc="upper right")
+        if len(self.xlabel):
+            ax.set_xlabel(self.xlabel)
+
+        line1.set_data(self.totalTime, self.h_num)
+        line1.set_color(self.colors[0])
+        line2.set_color(self.colors[1])
+        line3.set_color(self.colors[2])
+        fig.tight_layout()
+
+        def animate(i):
+            k = self.ind[i]
+            line2.set_data(self.totalTime, self.x_shift(k))
+            if self.y_num is not None:
+                line3.set_data(self.totalTime[:k], self.y_num[:k])
+
+        return fig, animate
+
+
+_worker = {}
+
+
+def _initWorker(setup, dpi):
+    fig, animate = setup()
+    fig.set_dpi(dpi)
+    _worker["canvas"] = FigureCanvasAgg(fig)
+    _worker["animate"] = animate
+
+
+def _renderChunk(frames):
+    canvas = _worker["canvas"]
+    rendered = []
+    for i in frames:
+        _worker["animate"](i)
+        canvas.draw()
+        rendered.append(np.asarray(canvas.buffer_rgba())[:, :, :3].copy())
+    return rendered
+
+
+def renderParallel(setup, frames, figName, fps=50, dpi=200, codec=None, workers=None, chunksize=8):
+    """
+    Render animation frames on a process pool and stream them to ffmpeg
+
+    Every worker calls setup() once to build its own figure and canvas.
+    Frames are rendered in chunks and written to ffmpeg in order; only a
+    few chunks per worker are in flight at any time. On Windows the caller
+    must be protected by if __name__ == "__main__".
+
+    :param setup: picklable callable returning (fig, animate), e.g. ConvFrames [callable]
+    :param frames: frame indexes passed to animate [iterable]
+    :param figName: output file name w/ folder path (.gif, .mp4, ...) [string]
+    :param fps: frames per second [float]
+    :param dpi: resolution of the rendered frames [int]
+    :param codec: "gif", "libx264", ... (None picks it from the file extension) [string]
+    :param workers: number of worker processes (None uses every core) [int]
+    :param chunksize: frames rendered per task [int]
+    """
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    frames = list(frames)
+    chunks = [frames[k:k + chunksize] for k in range(0, len(frames), chunksize)]
+
+    proc = None
+    with ProcessPoolExecutor(workers, initializer=_initWorker, initargs=(setup, dpi)) as pool:
+        maxPending = 2 * workers
+        pending = deque()
+        chunks = iter(chunks)
+        try:
+            for chunk in chunks:
+                pending.append(pool.submit(_renderChunk, chunk))
+                if len(pending) >= maxPending:
+                    break
+
+            while pending:
+                # os quadros são desenhados nos workers: aqui só a espera e a escrita
+                with stage("wait workers"):
+                    rendered = pending.popleft().result()
+                for frame in rendered:
+                    if proc is None:
+                        height, width = frame.shape[:2]
+                        cmd = ffmpegCommand(width, height, fps, figName, codec)
+                        proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+                    with stage("encode"):
+                        proc.stdin.write(frame.tobytes())
+
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append(pool.submit(_renderChunk, chunk))
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            if proc is not None:
+                proc.kill()
+            raise
+
+    if proc is not None:
+        proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg failed writing {figName}")
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+import sympy as sp
+
+# módulos usados por plotFunc/genConvGIF para avaliar expressões com degrau
+NUMPY_MODULES = ["numpy", {"Heaviside": lambda t: np.heaviside(t, 0)}]
+
+CACHE_SIZE = 256
+
+_cache = OrderedDict()
+_stats = {"hits": 0, "misses": 0, "disk": 0}
+_persistDir = os.environ.get("SINAIS_LAMBDIFY_CACHE")
+
+
+def _modulesKey(modules):
+    """
+    Hashable description of a lambdify module mapping
+    """
+    if modules is None or isinstance(modules, str):
+        return modules
+    if isinstance(modules, dict):
+        return tuple(sorted((name, _funcKey(f)) for name, f in modules.items()))
+    return tuple(_modulesKey(m) for m in modules)
+
+
+def _valueKey(value):
+    """
+    Key of a value captured by a function (default or closure cell)
+
+    Only values whose repr identifies them are accepted: anything else
+    (arrays, arbitrary objects) raises TypeError and the function is not cached.
+    """
+    if value is None or isinstance(value, (bool, int, float, complex, str, bytes)):
+        return repr(value)
+    if isinstance(value, (tuple, list)):
+        return (type(value).__name__,) + tuple(_valueKey(v) for v in value)
+    if isinstance(value, sp.Basic):
+        return sp.srepr(value)
+    if callable(value):
+        return _funcKey(value)
+    raise TypeError(f"cannot key captured value of type {type(value).__name__}")
+
+
+def _funcKey(f):
+    # lambdas recriadas a cada chamada têm o mesmo código: compara pelo bytecode,
+    # pelos valores padrão e pelo conteúdo das variáveis capturadas
+    code = getattr(f, "__code__", None)
+    if code is not None:
+        closure = tuple(_valueKey(cell.cell_contents) for cell in f.__closure__ or ())
+        return (
+            f.__module__, f.__qualname__, code.co_code, repr(code.co_consts),
+            _valueKey(f.__defaults__), _valueKey(f.__kwdefaults__ and tuple(sorted(f.__kwdefaults__.items()))),
+            closure,
+        )
+    return repr(f)
+
+
+def _sreprArgs(args):
+    if isinstance(args, (list, tuple)):
+        return tuple(_sreprArgs(a) for a in args)
+    return sp.srepr(args)
+
+
+def setPersistDir(path):
+    """
+    Enable (or disable, with None) on-disk persistence of generated source
+
+    :param path: folder where the lambdify source files are stored [string]
+    """
+    global _persistDir
+    _persistDir = path
+
+
+def clearCache():
+    """
+    Drop every compiled function kept in memory
+    """
+    _cache.clear()
+    for key in _stats:
+        _stats[key] = 0
+
+
+def cacheInfo():
+    """
+    Statistics of the compiled-function cache
+
+    :return: hits, misses, disk loads and current size [dict]
+    """
+    return dict(_stats, size=len(_cache), maxsize=CACHE_SIZE)
+
+
+def _load(path, modules):
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+
+    # namespace igual ao que o lambdify montaria para esses módulos
+    namespace = dict(sp.lambdify([], 0, modules=modules).__globals__)
+    code = compile(source, path, "exec")
+    func_code = next(c for c in code.co_consts if hasattr(c, "co_names"))
+    if any(name not in namespace for name in func_code.co_names):
+        return None
+
+    exec(code, namespace)
+    return namespace["_lambdifygenerated"]
+
+
+def _save(path, func):
+    import inspect
+
+    tmp = path + f".{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(inspect.getsource(func))
+    os.replace(tmp, path)
+
+
+def cachedLambdify(args, expr, modules=None):
+    """
+    sp.lambdify with a process-wide LRU cache of the compiled functions
+
+    The key is the srepr of the expression and of the arguments plus the
+    module mapping, so repeated plots of the same expression skip sympy code
+    generation. When a persistence folder is set (setPersistDir or the
+    SINAIS_LAMBDIFY_CACHE environment variable) the generated source is also
+    stored on disk and reused by later processes.
+
+    :param args: sympy variable(s) of the function
+    :param expr: sympy expression
+    :param modules: lambdify modules, NUMPY_MODULES by default
+
+    :return: numerical function [callable]
+    """
+    if modules is None:
+        modules = NUMPY_MODULES
+
+    try:
+        key = (sp.srepr(expr), _sreprArgs(args), _modulesKey(modules))
+    except TypeError:
+        # função do mapeamento captura valores sem chave confiável: sem cache
+        _stats["misses"] += 1
+        return sp.lambdify(args, expr, modules=modules)
+
+    func = _cache.get(key)
+    if func is not None:
+        _cache.move_to_end(key)
+        _stats["hits"] += 1
+        return func
+
+    _stats["misses"] += 1
+
+    path = None
+    if _persistDir is not None:
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+        path = os.path.join(_persistDir, digest + ".py")
+        if os.path.exists(path):
+            func = _load(path, modules)
+            if func is not None:
+                _stats["disk"] += 1
+
+    if func is None:
+        func = sp.lambdify(args, expr, modules=modules)
+        if path is not None:
+            os.makedirs(_persistDir, exist_ok=True)
+            _save(path, func)
+
+    _cache[key] = func
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+
+    return func
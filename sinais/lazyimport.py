@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+import importlib
+
+
+class LazyImport:
+    """
+    Placeholder for a module (or an attribute of one) imported on first use
+
+    On first access the real object is imported and written over the
+    placeholder in the namespace that owns it, so later lookups are plain
+    global lookups with no extra cost. Copies of the placeholder taken
+    before that (from package import name) keep the object too and only
+    pay one attribute lookup per use.
+
+    :param namespace: globals() of the module that uses the name [dict]
+    :param name: global name of the placeholder [string]
+    :param target: "package.module" or "package.module:attribute"; a leading dot
+                   makes it relative to the package of namespace [string]
+    """
+
+    __slots__ = ("_namespace", "_name", "_target", "_obj")
+
+    def __init__(self, namespace, name, target):
+        self._namespace = namespace
+        self._name = name
+        self._target = target
+        self._obj = None
+
+    def _resolve(self):
+        obj = self._obj
+        if obj is not None:
+            return obj
+
+        module, _, attr = self._target.partition(":")
+        obj = importlib.import_module(module, self._namespace.get("__package__"))
+        if attr:
+            obj = getattr(obj, attr)
+        # o alvo também pode ser um marcador de outro módulo
+        if isinstance(obj, LazyImport):
+            obj = obj._resolve()
+        self._obj = obj
+        self._namespace[self._name] = obj
+        return obj
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy import {self._target}>"
+
+
+def lazy(namespace, **targets):
+    """
+    Declare global names of a module as lazy imports
+
+        lazy(globals(), np="numpy", display="IPython.display:display")
+        lazy(globals(), cachedLambdify=".lambdacache:cachedLambdify")
+
+    :param namespace: globals() of the calling module [dict]
+    :param targets: global name -> "module" or "module:attribute" [strings]
+    """
+    for name, target in targets.items():
+        namespace[name] = LazyImport(namespace, name, target)
+
+
+def exports(namespace, **targets):
+    """
+    Declare names a module exports without importing them (PEP 562)
+
+        exports(globals(), genGIF=".render:genGIF", np="numpy")
+
+    Unlike lazy(), nothing is put in the namespace up front: the module
+    gets __getattr__ and __dir__, and the first lookup of a name imports
+    the real object and stores it, so "from module import name" gives the
+    object itself (picklable, usable with isinstance) and not a placeholder.
+
+    :param namespace: globals() of the calling module [dict]
+    :param targets: global name -> "module" or "module:attribute" [strings]
+    """
+
+    def __getattr__(name):
+        try:
+            target = targets[name]
+        except KeyError:
+            raise AttributeError(f"module {namespace['__name__']!r} has no attribute {name!r}") from None
+
+        module, _, attr = target.partition(":")
+        obj = importlib.import_module(module, namespace.get("__package__"))
+        if attr:
+            obj = getattr(obj, attr)
+        namespace[name] = obj
+        return obj
+
+    def __dir__():
+        return sorted(set(namespace) | set(targets))
+
+    namespace["__getattr__"] = __getattr__
+    namespace["__dir__"] = __dir__
+
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+from .lazyimport import lazy
+from .stageprofile import stage
+
+lazy(
+    globals(),
+    sp="sympy",
+    plt="matplotlib.pyplot",
+    Math="IPython.display:Math",
+    display="IPython.display:display",
+    cachedLambdify=".lambdacache:cachedLambdify",
+)
+
+def symdisp(expr, var, unit=" "):
+    """
+    Display sympy expressions in Latex style.
+
+    :param expr: expression in latex [string]
+    :param var: sympy variable, function, expression.
+    :param unit: string indicating unit of var [string]
+    """
+    display(Math(expr + sp.latex(var) + "\;" + "\mathrm{"+unit+"}"))
+
+
+# função para arredondamento de floats em expressões simbólicas
+def round_expr(expr, numDig):
+    """
+    Rounds numerical values in sympy expressions
+
+    :param expr: sympy symbolic expression
+    :param numDig: number of rounding decimals
+
+    :return: rounded expression
+    """
+    return expr.xreplace({n: round(n, numDig) for n in expr.atoms(sp.Number)})
+
+
+# Função para plot de funções do sympy
+def symplot(t, F, interval, funLabel, colors, xlabel="tempo [s]", ylabel=""):
+    """
+    Create plots of sympy symbolic functions.
+
+    :param t: sympy variable
+    :param F: sympy function F(t) or list of functions
+    :param interval: array of values of t where F should be evaluated [np.array]
+    :param funLabel: curve label(s) to be displayed in the plot [string or list of strings]
+    :param colors: color(s) for the plot(s) [string or list of strings]
+    :param xlabel: label for x-axis [string]
+    :param ylabel: label for y-axis [string]
+    """
+    fig = plt.figure()
+    if type(F) == list:
+        for indLabel, f in enumerate(F):
+            plotFunc(t, f, interval, funLabel[indLabel], colors[indLabel], xlabel, ylabel )
+    else:
+        plotFunc(t, F, interval, funLabel, colors, xlabel, ylabel)
+    plt.grid()
+    plt.close()
+    return fig
+
+
+def plotFunc(t, F, interval, funLabel, color, xlabel, ylabel):
+    with stage("lambdify"):
+        func = cachedLambdify(t, F)
+    f_num = func(interval)
+
+    plt.plot(interval, f_num, label=funLabel, color=color)
+    plt.legend(loc="upper right")
+    plt.xlim([min(interval), max(interval)])
+    plt.xlabel(xlabel)
+    plt.ylabel(ylabel)
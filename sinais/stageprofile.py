@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Optional per-stage profiling of the GIF and video generation
+
+    from sinais import profiling
+
+    with profiling("conv_trace.json"):
+        genConvGIF(...)
+
+or, without touching the code, SINAIS_PROFILE=1 (trace in sinais_trace.json)
+or SINAIS_PROFILE=<file.json>. Every stage records wall and CPU time; with
+memory=True (SINAIS_PROFILE_MEMORY=1) also the peak of memory allocated
+inside it, through tracemalloc. tracemalloc makes allocation-heavy stages
+several times slower, so times and memory are best measured in separate
+runs. At the end a summary table is printed and a Chrome trace is written,
+to be opened in chrome://tracing or https://ui.perfetto.dev.
+
+When profiling is off stage() returns a shared no-op context manager, so
+the instrumentation left in the code costs one function call.
+"""
+import atexit
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+# json e tracemalloc só são importados com o perfil ligado: este módulo é
+# importado pelo sinais, que precisa continuar leve
+tracemalloc = None
+
+# perfil ativo (None: instrumentação desligada)
+_profiler = None
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "args", "wall0", "cpu0", "mem0", "peak", "children")
+
+    def __init__(self, profiler, name, args):
+        self.profiler = profiler
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        prof = self.profiler
+        if prof.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if prof.stack:
+                # o pico anterior pertence ao estágio pai
+                parent = prof.stack[-1]
+                parent.peak = max(parent.peak, peak)
+            tracemalloc.reset_peak()
+            self.mem0 = self.peak = current
+
+        self.children = 0.0
+        prof.stack.append(self)
+        self.cpu0 = time.process_time()
+        self.wall0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall0
+        cpu = time.process_time() - self.cpu0
+
+        prof = self.profiler
+        prof.stack.pop()
+        parent = prof.stack[-1] if prof.stack else None
+
+        memory = None
+        if prof.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            memory = self.peak - self.mem0
+            if parent is not None:
+                parent.peak = max(parent.peak, self.peak)
+
+        if parent is not None:
+            parent.children += wall
+
+        prof.records.append(
+            (self.name, self.wall0 - prof.t0, wall, wall - self.children, cpu, memory, len(prof.stack), self.args)
+        )
+        return False
+
+
+class Profiler:
+    """
+    Records of the stages run while it is active
+
+    :param memory: track the peak memory of each stage with tracemalloc [bool]
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.records = []
+        self.stack = []
+        self.t0 = time.perf_counter()
+        self.elapsed = None
+        self._tracing = False
+
+    def start(self):
+        global tracemalloc
+
+        if self.memory and tracemalloc is None:
+            import tracemalloc
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._tracing = True
+        self.t0 = time.perf_counter()
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self.t0
+        if self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def summary(self):
+        """
+        Table with one line per stage name, in order of first appearance
+
+        :return: table [string]
+        """
+        stats = {}
+        for name, _, wall, own, cpu, memory, _, _ in self.records:
+            s = stats.setdefault(name, {"count": 0, "wall": 0.0, "self": 0.0, "cpu": 0.0, "max": 0.0, "memory": None})
+            s["count"] += 1
+            s["wall"] += wall
+            s["self"] += own
+            s["cpu"] += cpu
+            s["max"] = max(s["max"], wall)
+            if memory is not None:
+                s["memory"] = max(s["memory"] or 0, memory)
+
+        # ordem de início dos estágios, não de término
+        order = sorted(stats, key=lambda name: min(r[1] for r in self.records if r[0] == name))
+        total = self.elapsed if self.elapsed is not None else time.perf_counter() - self.t0
+
+        lines = [
+            f"{'stage':24s} {'count':>6s} {'wall [s]':>9s} {'self [s]':>9s} {'self %':>7s} "
+            f"{'cpu [s]':>9s} {'mean [ms]':>10s} {'max [ms]':>10s} {'peak [MiB]':>11s}"
+        ]
+        for name in order:
+            s = stats[name]
+            memory = f"{s['memory'] / 2**20:11.1f}" if s["memory"] is not None else f"{'-':>11s}"
+            lines.append(
+                f"{name:24s} {s['count']:6d} {s['wall']:9.3f} {s['self']:9.3f} {100 * s['self'] / total:6.1f}% "
+                f"{s['cpu']:9.3f} {1e3 * s['wall'] / s['count']:10.2f} {1e3 * s['max']:10.2f} {memory}"
+            )
+        lines.append(f"{'total':24s} {'':6s} {total:9.3f}")
+        return "\n".join(lines)
+
+    def trace(self):
+        """
+        Records in the Chrome trace event format
+
+        :return: trace [dict]
+        """
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "sinais"}}]
+        for name, start, wall, own, cpu, memory, _, args in sorted(self.records, key=lambda r: (r[1], r[6])):
+            info = {"cpu_ms": round(1e3 * cpu, 3), "self_ms": round(1e3 * own, 3)}
+            if memory is not None:
+                info["peak_kib"] = round(memory / 1024, 1)
+            info.update(args)
+            events.append({
+                "name": name, "cat": "stage", "ph": "X", "pid": pid, "tid": 0,
+                "ts": round(1e6 * start, 1), "dur": round(1e6 * wall, 1), "args": info,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def writeTrace(self, path):
+        import json
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.trace(), f, ensure_ascii=False)
+
+    def report(self, trace=None, out=None):
+        print(self.summary(), file=out or sys.stderr)
+        if trace:
+            self.writeTrace(trace)
+            print(f"trace written to {trace}", file=out or sys.stderr)
+
+
+def enabled():
+    return _profiler is not None
+
+
+def stage(name, **args):
+    """
+    Context manager timing one stage; a no-op unless profiling is on
+
+        with stage("draw", frame=i):
+            canvas.draw()
+
+    :param name: stage name, shared by every occurrence of the stage [string]
+    :param args: extra values shown in the trace, e.g. the frame index
+    """
+    if _profiler is None:
+        return _NULL_STAGE
+    return _Stage(_profiler, name, args)
+
+
+def profileFigure(fig):
+    """
+    Time every draw of a matplotlib figure as a "draw" stage
+
+    Meant for figures saved by FuncAnimation, whose drawing happens inside
+    matplotlib. Does nothing unless profiling is on.
+
+    :param fig: matplotlib figure
+    """
+    if _profiler is None:
+        return
+
+    draw = fig.draw
+
+    def profiledDraw(renderer):
+        with stage("draw"):
+            return draw(renderer)
+
+    fig.draw = profiledDraw
+
+
+@contextmanager
+def profiling(trace=None, memory=False, out=None):
+    """
+    Profile the stages run inside the block
+
+    :param trace: Chrome trace file written at the end, None for no trace [string]
+    :param memory: track the peak memory of each stage with tracemalloc [bool]
+    :param out: stream of the summary table, stderr by default
+
+    :return: the Profiler, also usable after the block
+    """
+    global _profiler
+
+    previous = _profiler
+    prof = Profiler(memory)
+    prof.start()
+    _profiler = prof
+    try:
+        yield prof
+    finally:
+        _profiler = previous
+        prof.stop()
+        prof.report(trace, out)
+
+
+def _fromEnvironment():
+    global _profiler
+
+    value = os.environ.get("SINAIS_PROFILE", "")
+    if value in ("", "0"):
+        return
+
+    trace = "sinais_trace.json" if value == "1" else value
+    prof = Profiler(os.environ.get("SINAIS_PROFILE_MEMORY", "") not in ("", "0"))
+    prof.start()
+    _profiler = prof
+
+    def report():
+        prof.stop()
+        prof.report(trace)
+
+    atexit.register(report)
+
+
+_fromEnvironment()
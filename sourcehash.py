@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+Source files a script depends on, and one hash of all of them
+
+    python sourcehash.py main.py
+
+Imports are collected statically from the source. Only modules found next
+to the script (or in the given root) are followed, recursively; installed
+packages are left out. A local package counts as all of its modules, so
+imports made lazily inside it are covered too.
+"""
+import argparse
+import ast
+import hashlib
+import sys
+from pathlib import Path
+
+
+def _moduleFiles(root, dotted):
+    """
+    Files of a dotted module name under root: the parent packages' __init__
+    and either module.py or every module of the package
+
+    :return: files [list of Paths], empty when the module is not local
+    """
+    parts = dotted.split(".")
+    folder = Path(root, *parts[:-1])
+    files = [Path(root, *parts[:i], "__init__.py") for i in range(1, len(parts))]
+    if not all(f.is_file() for f in files):
+        return []
+
+    module = folder / f"{parts[-1]}.py"
+    package = folder / parts[-1]
+    if module.is_file():
+        return files + [module]
+    if (package / "__init__.py").is_file():
+        return files + sorted(package.rglob("*.py"))
+    return []
+
+
+def localImports(path, root):
+    """
+    Local files imported by one source file
+
+    :param path: source file [Path]
+    :param root: folder of the top level modules [Path]
+
+    :return: files [set of Paths]
+    """
+    try:
+        tree = ast.parse(Path(path).read_bytes(), str(path))
+    except SyntaxError:
+        return set()
+
+    names = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                # import relativo: a partir do pacote do próprio arquivo
+                base = Path(path).parent
+                for _ in range(node.level - 1):
+                    base = base.parent
+                try:
+                    prefix = ".".join(base.relative_to(root).parts)
+                except ValueError:
+                    continue
+            else:
+                prefix = ""
+            module = ".".join(p for p in (prefix, node.module) if p)
+            names += [module] if module else []
+            # "from pacote import modulo" também importa o submódulo
+            names += [f"{module}.{alias.name}" if module else alias.name for alias in node.names]
+
+    files = set()
+    for name in names:
+        files.update(_moduleFiles(root, name))
+    return files
+
+
+def sourceClosure(path, root=None):
+    """
+    A source file and every local file it imports, directly or not
+
+    :param path: source file [string or Path]
+    :param root: folder of the top level modules, the folder of path by default
+
+    :return: files, path first and the others sorted [list of Paths]
+    """
+    path = Path(path).resolve()
+    root = Path(root).resolve() if root is not None else path.parent
+
+    seen = {path}
+    pending = [path]
+    while pending:
+        for dep in localImports(pending.pop(), root):
+            dep = dep.resolve()
+            if dep not in seen:
+                seen.add(dep)
+                pending.append(dep)
+
+    return [path] + sorted(seen - {path})
+
+
+def filesHash(files, base):
+    """
+    Hash of the names (relative to base) and contents of some files
+
+    :param files: files, in a fixed order [list of Paths]
+    :param base: folder the names are taken from [Path]
+
+    :return: sha256 digest [string]
+    """
+    hasher = hashlib.sha256()
+    for f in files:
+        try:
+            name = f.relative_to(base).as_posix()
+        except ValueError:
+            name = f.name
+        hasher.update(name.encode("utf-8") + b"\0")
+        hasher.update(hashlib.sha256(f.read_bytes()).digest())
+    return hasher.hexdigest()
+
+
+def sourceHash(path, root=None, include_self=True):
+    """
+    Hash of the contents of a source file and of its local imports
+
+    :param include_self: also hash path itself, not only its dependencies [bool]
+
+    :return: sha256 digest [string]
+    """
+    files = sourceClosure(path, root)
+    base = files[0].parent if root is None else Path(root).resolve()
+    return filesHash(files if include_self else files[1:], base)
+
+
+def skeletonHash(path, cls, methods):
+    """
+    Hash of a source file without the given methods of one class
+
+    Comments, blank lines and line numbers don't count: the hash is taken
+    over the syntax tree. Everything else counts, the module level code, the
+    other classes and the attributes and remaining methods of cls.
+
+    :param path: source file [string or Path]
+    :param cls: name of the class [string]
+    :param methods: names of the methods left out [iterable of strings]
+
+    :return: sha256 digest [string]
+    """
+    tree = ast.parse(Path(path).read_bytes(), str(path))
+    methods = set(methods)
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == cls:
+            node.body = [
+                item for item in node.body
+                if not (isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name in methods)
+            ]
+    return hashlib.sha256(ast.dump(tree).encode("utf-8")).hexdigest()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("file", help="script whose dependencies are listed")
+    parser.add_argument("--root", default=None, help="folder of the top level modules (default: the script's)")
+    args = parser.parse_args(argv)
+
+    root = Path(args.root or Path(args.file).parent).resolve()
+    for f in sourceClosure(args.file, root):
+        try:
+            print(f.relative_to(root))
+        except ValueError:
+            print(f)
+    print(sourceHash(args.file, root))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
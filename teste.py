@@ -1,27 +1,27 @@
 #!/usr/bin/env python
 from manim import *
-from manimlib.imports import *
-
-class Conv(GraphScene):
-    CONFIG = {
-        "y_max" : 30,
-        "y_min" : -10,
-        "x_max" : 10,
-        "x_min" : -10,
-        "y_tick_frequency" : 1,
-        "x_tick_frequency" : 1,
-        "graph_origin" : [0, -2.5, 0],
-        "y_axis_label": None,
-        "x_axis_label": None,
-        "x_axis_width": 20,
-        "y_axis_height": 40,
-    }
-    
+import numpy as np
+import sympy as sp
+
+from signalgraph import SlidingConvolution, axesPoints, stepGraph
+
+t_sym = sp.symbols("t", real=True)
+u = sp.Heaviside
+
+
+class Conv(Scene):
+    # eixo do gráfico: 1 unidade por segundo, origem em (0, y0)
+    y0 = -2.5
+    # reta numérica do resultado y(t)
+    yz = -0.5
+
     def construct(self):
+        y0, yz = self.y0, self.yz
+
         # Introduction
         title = Text("Continuous Convolution ")
         title.scale(2)
-        creators = Text("Made by \n Hossein Zaredar \& Matin Tavakoli")
+        creators = Text("Made by \n Hossein Zaredar & Matin Tavakoli")
         creators.scale(0.4)
         creators.move_to([5, -3.7, 0])
         self.play(Write(title), run_time=1.2)
@@ -31,12 +31,9 @@ class Conv(GraphScene):
         self.play(FadeOut(title))
         self.wait(2)
 
-        self.setup_axes()
-
-        # y0
-        y0 = -2.5
+        ax = self.setup_axes()
 
-        label_t = Text(" t ")
+        label_t = MathTex("t")
         label_t.move_to([6.5, 0.4 + y0, 0])
         label_t.set_color(RED)
         self.play(Write(label_t), run_time=1)
@@ -47,68 +44,36 @@ class Conv(GraphScene):
         self.play(Write(conv_text))
         self.wait(0.2)
 
-        conv_formula = Text("bosta")
+        conv_formula = MathTex(r"x(t)*h(t)", r"=", r"\int_{-\infty}^{\infty} x(\tau)h(t-\tau)\,d\tau")
         conv_formula.scale(0.85)
         conv_formula.move_to([-3.5, 2.2, 0])
         self.play(Write(conv_formula))
         self.wait(1)
 
-
-        # drawing x(x) = rect = u(t + 2) - u(t - 2)
-        xt = VGroup()
-        x1 = Line([-8, y0, 0], [-1, y0, 0])
-        x1.set_color(GREEN)
-        x2 = Line([-1, y0, 0], [-1, 1 + y0, 0])
-        x2.set_color(GREEN)
-        x3 = Line([-1, 1 + y0, 0], [1, 1 + y0, 0])
-        x3.set_color(GREEN)
-        x4 = Line([1, 1 + y0, 0], [1, y0, 0])
-        x4.set_color(GREEN)
-        x5 = Line([1, y0, 0], [8, y0, 0])
-        x5.set_color(GREEN)
-
-        xt.add(x1, x2, x3, x4, x5)
-        self.play(ShowCreation(x1, run_time=0.5))
-        self.play(ShowCreation(x2, run_time=0.5))
-        self.play(ShowCreation(x3, run_time=0.5))
-        self.play(ShowCreation(x4, run_time=0.5))
-        self.play(ShowCreation(x5, run_time=0.5))
+        # drawing x(t) = rect = u(t + 1) - u(t - 1)
+        xt = stepGraph(u(t_sym + 1) - u(t_sym - 1), t_sym, (-8, 8), ax=ax, color=GREEN)
+        self.play(Create(xt, run_time=2.5))
         self.wait(1)
 
-        xt_text = Text("x(t)=u(t+1)-u(t-1)")
+        xt_text = MathTex(r"x(t)=u(t+1)-u(t-1)")
         xt_text.set_color(GREEN)
         xt_text.move_to([3.5, 3, 0])
         self.play(Write(xt_text))
         self.wait(1)
 
-
         # drawing h(t) = u(t)
-        ht = VGroup()
-        h1 = Line([-12, y0, 0], [0, y0, 0])
-        h1.set_color(BLUE)
-        h2 = Line([0, y0, 0], [0, 1 + y0, 0])
-        h2.set_color(BLUE)
-        h3 = Line([0, 1 + y0, 0], [12, 1 + y0, 0])
-        h3.set_color(BLUE)
-
-        ht.add(h1, h2, h3)
-        self.play(ShowCreation(h1, run_time=0.5))
-        self.play(ShowCreation(h2, run_time=0.5))
-        self.play(ShowCreation(h3, run_time=0.5))
+        ht = stepGraph(u(t_sym), t_sym, (-12, 12), ax=ax, color=BLUE)
+        self.play(Create(ht, run_time=1.5))
         self.wait(1)
 
-        ht_text = Text("""
-            $$h(t)=u(t)$$
-        """)
+        ht_text = MathTex(r"h(t)=u(t)")
         ht_text.set_color(BLUE)
         ht_text.move_to([3.5, 2.3, 0])
         self.play(Write(ht_text))
         self.wait(1)
 
         # removing convolution text and putting the formula in a corner
-        corner_conv_formula = Tex("fodase")
-        
-
+        corner_conv_formula = MathTex(r"x(t)*h(t)", r"=\int_{-\infty}^{\infty} x(\tau)h(t-\tau)\,d\tau")
         corner_conv_formula.move_to([-3.5, 3, 0])
         corner_conv_formula.scale(0.8)
         self.play(
@@ -119,35 +84,27 @@ class Conv(GraphScene):
         )
         self.wait(0.2)
 
-        #drawing convolution rect
-        convolution_rect = Polygon([-5.45, 2.55, 0], [-1.6, 2.55, 0],
-                              [-1.6, 3.45, 0], [-5.45, 3.45, 0])
-        convolution_rect.set_color(WHITE)
-        convolution_rect.scale(1.1)
+        # drawing convolution rect
+        convolution_rect = SurroundingRectangle(corner_conv_formula, color=WHITE, buff=0.2)
         self.play(Write(convolution_rect))
         self.wait(1)
 
-
         # step 1: t -> tau
-        t_to_tau = Text("""$$Step \\ 1: \\; t \\rightarrow \\tau$$""")
+        t_to_tau = MathTex(r"Step \ 1: \; t \rightarrow \tau")
         t_to_tau.scale(0.9)
         t_to_tau.move_to([-3.5, 2.1, 0])
         self.play(Write(t_to_tau))
         self.wait(1)
 
-        xtau_text = Text("""
-            $$x(\\tau)=u(\\tau+1)-u(\\tau-1)$$
-        """)
+        xtau_text = MathTex(r"x(\tau)=u(\tau+1)-u(\tau-1)")
         xtau_text.set_color(GREEN)
         xtau_text.move_to([3.5, 3, 0])
 
-        htau_text = Text("""
-            $$h(\\tau)=u(\\tau)$$
-        """)
+        htau_text = MathTex(r"h(\tau)=u(\tau)")
         htau_text.set_color(BLUE)
         htau_text.move_to([3.5, 2.3, 0])
 
-        label_tau = Text("""$$\\tau$$""")
+        label_tau = MathTex(r"\tau")
         label_tau.move_to([6.5, 0.4 + y0, 0])
         label_tau.set_color(RED)
 
@@ -158,68 +115,46 @@ class Conv(GraphScene):
         )
         self.wait(1)
 
-
         # step 2: h(tau) -> h(-tau)
         self.play(FadeOut(t_to_tau))
-        htau_to_hmtau = Text("""$Step \\ 2: \\; h(\\tau) \\rightarrow h(-\\tau)$""")
+        htau_to_hmtau = MathTex(r"Step \ 2: \; h(\tau) \rightarrow h(-\tau)")
         htau_to_hmtau.scale(0.9)
         htau_to_hmtau.move_to([-3.6, 2.1, 0])
         self.play(Write(htau_to_hmtau))
         self.wait(1)
 
-        hmtau_text = Text("""
-            $$h(-\\tau)=u(-\\tau)$$
-        """)
+        hmtau_text = MathTex(r"h(-\tau)=u(-\tau)")
         hmtau_text.set_color(BLUE)
         hmtau_text.move_to([3.5, 2.3, 0])
 
         # drawing h(-tau) = u(-tau)
-        hmtau = VGroup()
-        hm1 = Line([-12, 1 + y0, 0], [0, 1 + y0, 0])
-        hm1.set_color(BLUE)
-        hm2 = Line([0, 1 + y0, 0], [0, y0, 0])
-        hm2.set_color(BLUE)
-        hm3 = Line([0, y0, 0], [12, y0, 0])
-        hm3.set_color(BLUE)
-
-        hmtau.add(hm1, hm2, hm3)
-        self.play(ReplacementTransform(h1, hm3), ReplacementTransform(h3, hm1), Write(hm2),
-            ReplacementTransform(htau_text, hmtau_text))
-        self.remove(h2)
+        hmtau = stepGraph(u(-t_sym), t_sym, (-12, 12), ax=ax, color=BLUE)
+        self.play(ReplacementTransform(ht, hmtau), ReplacementTransform(htau_text, hmtau_text))
         self.wait(1)
 
-
         # step 3: moving window and multiply
         self.play(FadeOut(htau_to_hmtau))
 
-        wind_and_multiply = Text("Step 3 \\ : Sliding Window")
+        wind_and_multiply = Text("Step 3: Sliding Window")
         wind_and_multiply.scale(0.9)
         wind_and_multiply.move_to([-3.5, 2.1, 0])
 
-        guide_1 = Text("""
-            for all t: take the integral of 
-        """)
+        guide_1 = Text("for all t: take the integral of")
         guide_1.scale(0.75)
         guide_1.move_to([-3.8, 0.6, 0])
 
-        guide_2 = Text("""
-            the multiplication of the signals,
-        """)
+        guide_2 = Text("the multiplication of the signals,")
         guide_2.scale(0.75)
         guide_2.move_to([-3.5, 0.25, 0])
 
-        guide_3 = Text("""
-            from $-\\infty$ to $+\\infty$. 
-        """)
+        guide_3 = Tex(r"from $-\infty$ to $+\infty$.")
         guide_3.scale(0.75)
         guide_3.move_to([-4.7, -0.1, 0])
-        
+
         self.play(Write(wind_and_multiply))
         self.wait(0.5)
 
-        htmtau_text = Text("""
-            $$h(t-\\tau)=u(t-\\tau)$$
-        """)
+        htmtau_text = MathTex(r"h(t-\tau)=u(t-\tau)")
         htmtau_text.set_color(BLUE)
         htmtau_text.move_to([3.5, 2.3, 0])
         self.play(ReplacementTransform(hmtau_text, htmtau_text))
@@ -232,71 +167,47 @@ class Conv(GraphScene):
 
         self.play(FadeOut(guide_1), FadeOut(guide_2), FadeOut(guide_3))
 
-        # moving window group
-        window = VGroup()
-        window.add(hmtau)
+        # moving window: h(t-τ), seta e leitura de t seguem um único ValueTracker
+        t_value = ValueTracker(0)
         offset = -4
 
-        # arrow
         arr = Arrow([0, y0 - 0.8, 0], [0, y0 + 0.2, 0])
         self.play(Write(arr))
-        window.add(arr)
 
-       # moving window to the left
-        self.play(
-            hmtau.shift, [offset, 0, 0],
-            arr.shift, [offset, 0, 0],
-            run_time=2
-        )
-        self.wait(1)
-        
-        # ValueTracker for t
-        t_label = Text("t=", )
-        t_label.scale(0.8)
-        t_label.move_to([offset - 0.8, -3.3, 0])
+        window = VGroup(hmtau, arr)
+        window.add_updater(lambda mob: mob.shift((t_value.get_value() - arr.get_center()[0]) * RIGHT))
 
-        def t_updater(obj):
-            val = t_value.get_value()
-            obj.set_value(val)
-            obj.move_to([val + 0, -3.3, 0])
+        # moving window to the left
+        self.add(window)
+        self.play(t_value.animate.set_value(offset), run_time=2)
+        self.wait(1)
 
-        t_value = ValueTracker(offset)
+        t_label = MathTex("t=")
+        t_label.scale(0.8)
         t_text = DecimalNumber(offset)
         t_text.scale(0.8)
-        t_text.add_updater(t_updater)
-        t_text.move_to([offset + 0, -3.3, 0])
-        
+        t_text.move_to([offset, -3.3, 0])
+        t_label.next_to(t_text, LEFT, buff=0.1)
 
         self.play(Write(t_text), Write(t_label))
         self.wait(1)
 
-        window.add(t_label)
-
+        window.add(t_text, t_label)
+        t_text.add_updater(lambda mob: mob.set_value(t_value.get_value()))
 
         # drawing an extra number line for the result of convolution
-        yz = -0.5
-        number_line = NumberLine(y_min=-8, y_max=8, unit_size=1, numbers_with_elongated_ticks=[])
+        number_line = NumberLine(x_range=[-8, 8, 1], unit_size=1, include_numbers=False)
         number_line.set_stroke(width=1)
         number_line.move_to([0, yz, 0])
         self.play(Write(number_line))
 
-        y_text = Text("y(t)")
+        y_text = MathTex("y(t)")
         y_text.set_color(ORANGE)
         y_text.scale(0.8)
         y_text.move_to([-5.5, -0.1, 0])
         self.play(Write(y_text))
         self.wait(1)
 
-
-        # creating the result of convolution
-        y1 = Line([-4, yz, 0], [-1, yz, 0])
-        y1.set_color(ORANGE)
-        y2 = Line([-1, 0 + yz, 0], [1, 2 + yz, 0])
-        y2.set_color(ORANGE)
-        y3 = Line([1, 2 + yz, 0], [4, 2 + yz, 0])
-        y3.set_color(ORANGE)
-
-
         # dots 1
         dots_1 = Text("...")
         dots_1.move_to([-4.32, -0.5, 0])
@@ -304,37 +215,26 @@ class Conv(GraphScene):
         dots_1.set_color(ORANGE)
         self.play(Write(dots_1))
 
-        # moving window
-        self.play(
-            window.shift, [3, 0, 0],
-            t_value.set_value, -1,
-            ShowCreation(y1),
-            rate_func=linear,
-            run_time=4
+        # área da sobreposição e y(t) na reta de cima, calculados a cada quadro
+        tau = np.linspace(-12, 12, 2401)
+        conv = SlidingConvolution(
+            t_value, tau, np.heaviside(tau + 1, 1) - np.heaviside(tau - 1, 1),
+            tau, np.heaviside(tau, 1),
+            axesPoints(ax),
+            lambda ts, ys: np.column_stack([ts, yz + ys, np.zeros_like(ts)]),
+            readout=False,
         )
+        conv.area.set_fill(YELLOW, opacity=0.5)
+        conv.trace.set_stroke(ORANGE)
+        self.add(conv)
 
+        # moving window
+        for t_end in (-1, 1, 4):
+            self.play(t_value.animate.set_value(t_end), rate_func=linear, run_time=4)
 
-        # handing the area
-        one = self.get_graph(lambda x: 1, x_min=-1, x_max=1)
-        area = self.color_area(one, -1, 1)
-        area.set_color(YELLOW)
-
-        self.play(
-            window.shift, [2, 0, 0],
-            t_value.set_value, 1,
-            ShowCreation(area),
-            ShowCreation(y2),
-            rate_func=linear,
-            run_time=4
-        )
-
-        self.play(
-            window.shift, [3, 0, 0],
-            t_value.set_value, 4,
-            ShowCreation(y3),
-            rate_func=linear,
-            run_time=4
-        )
+        window.clear_updaters()
+        conv.clear_updaters()
+        t_text.clear_updaters()
 
         # dots 2
         dots_2 = Text("...")
@@ -346,42 +246,35 @@ class Conv(GraphScene):
         self.wait(2)
 
         # removing stuff
-        self.play(FadeOut(hmtau), FadeOut(label_tau), FadeOut(label_t), FadeOut(arr), FadeOut(t_text),
-            FadeOut(t_label), FadeOut(xt), FadeOut(area), FadeOut(xtau_text), FadeOut(self.x_axis))
+        self.play(FadeOut(hmtau), FadeOut(label_t), FadeOut(arr), FadeOut(t_text),
+            FadeOut(t_label), FadeOut(xt), FadeOut(conv.area), FadeOut(ax.x_axis))
         self.play(FadeOut(convolution_rect), FadeOut(corner_conv_formula),
-            FadeOut(xt_text),FadeOut(htmtau_text), FadeOut(wind_and_multiply))
+            FadeOut(xt_text), FadeOut(htmtau_text), FadeOut(wind_and_multiply))
 
-        t_yt = Text(" t ")
+        t_yt = MathTex("t")
         t_yt.set_color(ORANGE)
         t_yt.move_to([6.5, 0.4 + yz, 0])
         self.play(Write(t_yt))
 
         self.wait(3)
 
-
     def setup_axes(self):
-        GraphScene.setup_axes(self)
-
-        # width of edges
-        self.x_axis.set_stroke(width=1)
-        self.y_axis.set_stroke(width=1)
+        # mesmo enquadramento do antigo GraphScene: x em [-10, 10], y em [-10, 30]
+        ax = Axes(
+            x_range=[-10, 10, 1],
+            y_range=[-10, 30, 1],
+            x_length=20,
+            y_length=40,
+            tips=False,
+        )
+        ax.shift([0, self.y0, 0] - ax.c2p(0, 0))
 
-        # color of edges
-        self.x_axis.set_color(RED)
-        self.y_axis.set_color(RED)
+        # width and color of edges
+        ax.set_stroke(width=1)
+        ax.set_color(RED)
         self.play(
             *[Write(objeto)
-            for objeto in [self.y_axis, self.x_axis]],
+            for objeto in [ax.y_axis, ax.x_axis]],
             run_time=2
-    )
-
-    def color_area(self, graph, t_min, t_max):
-        numerator = max(t_max - t_min, 0.0001)
-        dx = float(numerator) / 1000
-        return self.get_riemann_rectangles(
-            graph,
-            x_min=t_min,
-            x_max=t_max,
-            dx=dx,
-            stroke_width=0,
-        ).set_fill(opacity=0.5)
\ No newline at end of file
+        )
+        return ax
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+import os
+import sys
+
+import matplotlib
+
+# módulos da raiz (benchmark, batchjobs, mediacache...) importáveis nos testes
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+matplotlib.use("Agg")
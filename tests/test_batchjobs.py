@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import json
+
+import numpy as np
+import pytest
+
+import batchjobs
+
+
+def sweep(output, R=(1, 2)):
+    return {
+        "kind": "sweep", "circuit": "RC", "t": [0, 5, 50], "output": str(output),
+        "params": {"v_t0": 0, "v_inf": 5, "t0": 0, "R": list(R), "C": 0.5},
+    }
+
+
+def write_jobs(path, specs):
+    lines = [json.dumps({"request_id": "x", "title": "not a job"})]
+    lines += [json.dumps(spec) for spec in specs]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_jobHash_ignores_output_and_line():
+    a = dict(sweep("a.npz"), line=3)
+    b = dict(sweep("other/b.npz"), line=9)
+    assert batchjobs.jobHash(a) == batchjobs.jobHash(b)
+    assert batchjobs.jobHash(a) != batchjobs.jobHash(sweep("a.npz", R=(1, 3)))
+    # a extensão decide o formato da saída
+    assert batchjobs.jobHash(a) != batchjobs.jobHash(sweep("a.npy"))
+
+
+def test_jobHash_follows_scene_imports(tmp_path):
+    (tmp_path / "helpers.py").write_text("K = 1\n", encoding="utf-8")
+    (tmp_path / "scene.py").write_text("from helpers import K\n", encoding="utf-8")
+    spec = {"kind": "scene", "file": str(tmp_path / "scene.py"), "scene": "S", "quality": "l", "output": "s.mp4"}
+
+    before = batchjobs.jobHash(spec)
+    (tmp_path / "helpers.py").write_text("K = 2\n", encoding="utf-8")
+    assert batchjobs.jobHash(spec) != before
+
+
+def test_jobHash_follows_sinais(monkeypatch):
+    spec = sweep("a.npz")
+    before = batchjobs.jobHash(spec)
+    monkeypatch.setattr(batchjobs, "sinaisHash", lambda: "edited")
+    assert batchjobs.jobHash(spec) != before
+
+
+def test_readJobs_skips_other_lines(tmp_path):
+    path = write_jobs(tmp_path / "jobs.jsonl", [sweep("a.npz"), {"kind": "sweep"}])
+    jobs, skipped = batchjobs.readJobs(path)
+    assert [job["line"] for job in jobs] == [2]
+    assert skipped == 2
+
+
+def test_runBatch_builds_once_and_resumes(tmp_path):
+    out = tmp_path / "out"
+    specs = [sweep(out / "a.npz"), sweep(out / "copy.npz"), sweep(out / "b.npz", R=(3,))]
+    path = write_jobs(tmp_path / "jobs.jsonl", specs)
+    cache = tmp_path / "cache"
+
+    counts = batchjobs.runBatch(path, workers=1, cache=cache, log=lambda *a: None)
+    assert (counts["jobs"], counts["unique"], counts["built"], counts["failed"]) == (3, 2, 2, 0)
+    data = np.load(out / "a.npz")
+    assert data["vC"].shape == (2, 50)
+    assert (out / "copy.npz").read_bytes() == (out / "a.npz").read_bytes()
+
+    # saída apagada: vem do objeto já construído, sem reconstruir
+    (out / "b.npz").unlink()
+    counts = batchjobs.runBatch(path, workers=1, cache=cache, log=lambda *a: None)
+    assert (counts["cached"], counts["built"]) == (2, 0)
+    assert (out / "b.npz").exists()
+
+
+def test_runBatch_retries_failed_and_cut_entries(tmp_path):
+    good = sweep(tmp_path / "good.npz")
+    bad = dict(sweep(tmp_path / "bad.npz"), circuit="RLCmissing")
+    path = write_jobs(tmp_path / "jobs.jsonl", [good, bad])
+    cache = tmp_path / "cache"
+
+    counts = batchjobs.runBatch(path, workers=1, cache=cache, log=lambda *a: None)
+    assert (counts["built"], counts["failed"]) == (1, 1)
+
+    # linha cortada no fim do log, como numa interrupção
+    with open(cache / "progress.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"hash": "abc", "sta')
+    counts = batchjobs.runBatch(path, workers=1, cache=cache, log=lambda *a: None)
+    assert (counts["cached"], counts["failed"]) == (1, 1)
+    assert not list((cache / "objects").glob("*.part*"))
+
+
+def test_jobs_file_is_required():
+    with pytest.raises(SystemExit):
+        batchjobs.main([])
@@ -0,0 +1,50 @@
+# -*- coding: utf-8 -*-
+import benchmark
+
+
+def results(**entries):
+    return {"metadata": {}, "results": entries}
+
+
+def entry(best, **params):
+    return {"params": params, "times": [best], "min": best, "median": best}
+
+
+def test_compare_flags_slowdowns_above_threshold():
+    baseline = results(a=entry(1.0, n=1), b=entry(1.0, n=1), c=entry(2.0, n=1))
+    current = results(a=entry(1.05, n=1), b=entry(1.2, n=1), c=entry(1.0, n=1))
+
+    rows = {row[0]: row for row in benchmark.compare(current, baseline, 0.1)}
+    assert rows["a"][3:] == (1.05, False)
+    assert rows["b"][4] is True
+    assert rows["c"][3:] == (0.5, False)
+
+
+def test_compare_skips_unmatched_workloads():
+    baseline = results(a=entry(1.0, n=1), b=entry(1.0, n=1), c={"skipped": "no manim"})
+    current = results(a=entry(5.0, n=2), c=entry(1.0), d=entry(1.0), b={"skipped": "no manim"})
+    assert benchmark.compare(current, baseline, 0.1) == []
+
+
+def test_timeWorkload_drops_warmup_and_cleans_up():
+    calls = []
+
+    def make():
+        return {"n": 1}, lambda: calls.append("run"), lambda: calls.append("cleanup")
+
+    result = benchmark.timeWorkload(make, repeat=3, budget=60)
+    assert calls == ["run"] * 4 + ["cleanup"]
+    assert len(result["times"]) == 3
+    assert result["min"] <= result["median"]
+
+
+def test_pillow_skips_long_gifs():
+    table = benchmark.workloads("pillow")
+    frames = max(benchmark.GIF_FRAMES)
+    assert frames > benchmark.PILLOW_MAX_FRAMES
+    try:
+        table[f"gif/{frames}"]()
+    except benchmark.Skipped:
+        pass
+    else:
+        raise AssertionError("expected the workload to be skipped")
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+import sympy as sp
+
+from sinais import circuits
+from sinais.lambdacache import cachedLambdify
+
+
+@pytest.fixture(autouse=True)
+def solutions_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("SINAIS_CACHE_DIR", str(tmp_path))
+
+
+def evaluate(expr, t, grid):
+    return np.broadcast_to(np.asarray(cachedLambdify(t, expr)(grid), dtype=float), grid.shape)
+
+
+# (R, L, C): super, sub e criticamente amortecido
+RLC_SETS = [(5.0, 1.0, 0.25), (1.0, 1.0, 0.25), (4.0, 1.0, 0.25)]
+
+
+@pytest.mark.parametrize("R, L, C", RLC_SETS)
+@pytest.mark.parametrize("method, tol", [("foh", 1e-8), ("zoh", 1e-8), ("rk4", 1e-8), ("euler", 5e-2)])
+def test_numeric_matches_analytic_step(R, L, C, method, tol):
+    vC_t0, iL_t0, Vs = 1.0, 0.5, 5.0
+    grid = np.linspace(0, 8, 4001)
+    i, vR, vL, vC = circuits.responseRLCser_num(R, L, C, vC_t0, iL_t0, Vs * np.ones_like(grid), grid, method)
+
+    _, _, iL_ref, vC_ref, _, t = circuits.responseRLCser(vC_t0, iL_t0, Vs, 0, R, L, C)
+    np.testing.assert_allclose(vC, evaluate(vC_ref, t, grid), atol=tol)
+    np.testing.assert_allclose(i, evaluate(iL_ref, t, grid), atol=tol)
+    np.testing.assert_allclose(vR + vL + vC, Vs)
+
+
+def test_first_order_hold_is_exact_for_linear_sources():
+    R, L, C = 1.0, 1.0, 0.25
+    grid = np.linspace(0, 10, 201)
+    fine = np.linspace(0, 10, 200001)
+    ref = circuits.responseRLCser_num(R, L, C, 1.0, 0.5, 0.7 * fine, fine, "rk4")[3][::1000]
+
+    foh = circuits.responseRLCser_num(R, L, C, 1.0, 0.5, 0.7 * grid, grid, "foh")[3]
+    zoh = circuits.responseRLCser_num(R, L, C, 1.0, 0.5, 0.7 * grid, grid, "zoh")[3]
+    np.testing.assert_allclose(foh, ref, atol=1e-9)
+    assert np.max(np.abs(zoh - ref)) > 1e-3
+
+
+def test_hold_falls_back_to_rk4_on_nonuniform_grids():
+    grid = np.sort(np.concatenate([np.linspace(0, 5, 300), [0.0123, 2.345]]))
+    Vs = np.sin(grid)
+    for method in ("foh", "zoh"):
+        result = circuits.responseRLCser_num(1.0, 1.0, 0.25, 0.0, 0.0, Vs, grid, method)
+        expected = circuits.responseRLCser_num(1.0, 1.0, 0.25, 0.0, 0.0, Vs, grid, "rk4")
+        np.testing.assert_array_equal(result[3], expected[3])
+
+
+def test_unknown_method():
+    grid = np.linspace(0, 1, 10)
+    with pytest.raises(ValueError):
+        circuits.responseRLCser_num(1, 1, 1, 0, 0, grid, grid, "trapezoid")
+
+
+def test_RL_RC_vec_match_symbolic():
+    grid = np.linspace(-1, 6, 300)
+    R = np.array([0.5, 2.0, 10.0])
+    L = np.array([1.0, 0.3, 2.0])
+
+    iL, vL, τ = circuits.responseRL_vec(1.0, 3.0, 0.5, R, L, grid)
+    vC, iC, τC = circuits.responseRC_vec(2.0, -1.0, 0.5, R, L, grid)
+    for k in range(len(R)):
+        iL_ref, vL_ref, τ_ref, t = circuits.responseRL(1.0, 3.0, 0.5, R[k], L[k])
+        np.testing.assert_allclose(iL[k], evaluate(iL_ref, t, grid), atol=1e-9)
+        np.testing.assert_allclose(vL[k][grid > 0.5], evaluate(vL_ref, t, grid)[grid > 0.5], atol=1e-9)
+        assert τ[k] == pytest.approx(float(τ_ref))
+
+        vC_ref, iC_ref, τ_ref, t = circuits.responseRC(2.0, -1.0, 0.5, R[k], L[k])
+        np.testing.assert_allclose(vC[k], evaluate(vC_ref, t, grid), atol=1e-9)
+        np.testing.assert_allclose(iC[k][grid > 0.5], evaluate(iC_ref, t, grid)[grid > 0.5], atol=1e-9)
+        assert τC[k] == pytest.approx(float(τ_ref))
+
+
+@pytest.mark.parametrize("name", ["RLCser", "RLCpar"])
+def test_RLC_vec_match_symbolic(name):
+    grid = np.linspace(-1, 6, 300)
+    R, L, C = (np.array(v) for v in zip(*RLC_SETS))
+    if name == "RLCpar":
+        # α = 1/(2RC) e ω0 = 2: super, sub e criticamente amortecido
+        R = np.array([0.5, 4.0, 1.0])
+    vec = getattr(circuits, f"response{name}_vec")
+    sym = getattr(circuits, f"response{name}")
+
+    α, ω0, iL, vC, resp = vec(1.0, 0.5, 2.0, 0.5, R, L, C, grid)
+    for k in range(len(R)):
+        α_ref, ω0_ref, iL_ref, vC_ref, resp_ref, t = sym(1.0, 0.5, 2.0, 0.5, R[k], L[k], C[k])
+        assert resp[k] == resp_ref
+        assert (α[k], ω0[k]) == pytest.approx((α_ref, ω0_ref))
+        np.testing.assert_allclose(iL[k], evaluate(iL_ref, t, grid), atol=1e-8)
+        np.testing.assert_allclose(vC[k], evaluate(vC_ref, t, grid), atol=1e-8)
+
+
+@pytest.mark.parametrize("R, iL_form, vC_form", [
+    (5.0, "-0.666666666666667*exp(-4.0*t) + 1.16666666666667*exp(-1.0*t)",
+     "5 + 0.666666666666667*exp(-4.0*t) - 4.66666666666667*exp(-1.0*t)"),
+    (1.0, "(1.93649167310371*sin(1.93649167310371*t) + 0.5*cos(1.93649167310371*t))*exp(-0.5*t)",
+     "5 - 4.0*cos(1.93649167310371*t)*exp(-0.5*t)"),
+    (4.0, "(0.5 + 3.0*t)*exp(-2.0*t)", "5 + (-4.0 - 6.0*t)*exp(-2.0*t)"),
+])
+def test_symbolic_RLC_keeps_the_baseline_form(R, iL_form, vC_form):
+    # formas mostradas aos alunos por symdisp, iguais às do utils original
+    _, _, iL, vC, _, t = circuits.responseRLCser(1.0, 0.5, 5, 0, R, 1.0, 0.25)
+    assert str(iL.args[1][0]) == iL_form
+    assert str(vC.args[1][0]) == vC_form
+
+
+def test_symbolic_RLCpar_current_and_voltage_are_collected():
+    _, _, iL, vC, _, t = circuits.responseRLCpar(0, 0, 5, 0, 1.0, 1.0, 0.25)
+    assert str(vC.args[1][0]) == "20.0*t*exp(-2.0*t)"
+    assert str(iL.args[1][0]) == "5 + (-5 - 10.0*t)*exp(-2.0*t)"
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+import sympy as sp
+
+from sinais._conv import chooseMethod, convolve, convPiecewise, convTime
+from sinais.convolution import flipShift
+from sinais.lambdacache import cachedLambdify
+
+t = sp.symbols("t", real=True)
+u = sp.Heaviside
+
+
+@pytest.mark.parametrize("method", ["auto", "direct", "fft", "oa"])
+@pytest.mark.parametrize("mode", ["full", "same", "valid"])
+@pytest.mark.parametrize("n, m", [(7, 7), (50, 13), (13, 50), (300, 1000), (4000, 40)])
+def test_convolve_matches_numpy(n, m, mode, method):
+    rng = np.random.default_rng(n * m)
+    x = rng.standard_normal(n)
+    h = rng.standard_normal(m)
+    np.testing.assert_allclose(convolve(x, h, mode, method), np.convolve(x, h, mode), atol=1e-9)
+
+
+def test_convolve_rejects_unknown_options():
+    with pytest.raises(ValueError):
+        convolve(np.ones(3), np.ones(3), method="magic")
+    with pytest.raises(ValueError):
+        convolve(np.ones(3), np.ones(3), mode="middle")
+
+
+def test_chooseMethod():
+    assert chooseMethod(10, 10**6) == "direct"
+    assert chooseMethod(1000, 10**6) == "oa"
+    assert chooseMethod(10**5, 10**5) == "fft"
+    # simétrico nos comprimentos
+    assert chooseMethod(10**6, 1000) == chooseMethod(1000, 10**6)
+
+
+@pytest.mark.parametrize("method", ["auto", "direct", "fft", "oa"])
+@pytest.mark.parametrize("start", [-4.0, -3.97, 0.0])
+def test_convTime_same_is_aligned(start, method):
+    # rect * rect = triângulo, com o grid começando em qualquer origem
+    totalTime = start + np.arange(1000) * 0.01
+    rect = ((totalTime >= 0) & (totalTime < 1)).astype(float)
+    y, ty = convTime(rect, rect, totalTime, "same", method)
+
+    np.testing.assert_array_equal(ty, totalTime)
+    expected = np.clip(1 - np.abs(totalTime - 1), 0, None)
+    np.testing.assert_allclose(y, expected, atol=0.011)
+
+
+def test_convTime_full_times():
+    totalTime = np.linspace(-2, 3, 501)
+    x = np.exp(-np.abs(totalTime))
+    y, ty = convTime(x, x, totalTime, "full", "direct")
+    dt = totalTime[1] - totalTime[0]
+    np.testing.assert_allclose(y, np.convolve(x, x) * dt)
+    np.testing.assert_allclose(ty, 2 * totalTime[0] + np.arange(len(y)) * dt)
+
+
+@pytest.mark.parametrize("x, h", [
+    (u(t + 1) - u(t - 1), sp.exp(-t) * u(t)),
+    (u(t) - u(t - 2), u(t) - u(t - 1)),
+    (t * u(t), u(t - 1)),
+    (sp.sin(t) * u(t), u(t) - u(t - 3)),
+])
+def test_convPiecewise_matches_sampled(x, h):
+    totalTime = np.linspace(-5, 10, 6001)
+    y_num, _ = convTime(
+        cachedLambdify(t, h)(totalTime) + 0 * totalTime,
+        cachedLambdify(t, x)(totalTime) + 0 * totalTime,
+        totalTime,
+    )
+    y = cachedLambdify(t, convPiecewise(x, h, t))(totalTime) + 0 * totalTime
+    np.testing.assert_allclose(y, y_num, atol=0.02)
+
+
+def test_convPiecewise_rejects_other_signals():
+    with pytest.raises((ValueError, NotImplementedError)):
+        convPiecewise(sp.exp(-t**2), u(t), t)
+
+
+@pytest.mark.parametrize("grid", ["uniform", "nonuniform"])
+def test_flipShift_matches_subs(grid):
+    x = (u(t + 1) - u(t - 2)) * sp.exp(-t / 3)
+    totalTime = np.linspace(-4, 6, 401)
+    if grid == "nonuniform":
+        totalTime = np.sort(np.concatenate([totalTime, totalTime[:-1] + 0.01]))
+    x_shift = flipShift(cachedLambdify(t, x), totalTime)
+
+    for a in [0, 57, 200, len(totalTime) - 1]:
+        x_a = x.subs({t: totalTime[a] - t})
+        expected = cachedLambdify(t, x_a)(totalTime) + 0 * totalTime
+        # só longe dos degraus, onde a interpolação pode cair do outro lado
+        smooth = np.abs(np.abs(totalTime[a] - totalTime - 0.5) - 1.5) > 0.05
+        np.testing.assert_allclose(x_shift(a)[smooth], expected[smooth], atol=1e-3)
+
+
+def test_flipShift_uniform_grid_is_exact():
+    x = sp.exp(-t**2)
+    totalTime = np.linspace(-3, 3, 121)
+    x_shift = flipShift(cachedLambdify(t, x), totalTime)
+    for a in [0, 60, 120]:
+        np.testing.assert_allclose(x_shift(a), np.exp(-(totalTime[a] - totalTime) ** 2), atol=1e-12)
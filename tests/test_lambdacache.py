@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+import sympy as sp
+
+from sinais import lambdacache as lc
+
+t = sp.symbols("t", real=True)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    persist = lc._persistDir
+    lc.setPersistDir(None)
+    lc.clearCache()
+    yield
+    lc.setPersistDir(persist)
+    lc.clearCache()
+
+
+def test_hit_and_miss():
+    f = lc.cachedLambdify(t, sp.exp(-t) * sp.Heaviside(t))
+    g = lc.cachedLambdify(t, sp.exp(-t) * sp.Heaviside(t))
+    lc.cachedLambdify(t, sp.exp(-2 * t))
+
+    assert f is g
+    info = lc.cacheInfo()
+    assert (info["hits"], info["misses"], info["size"]) == (1, 2, 2)
+    np.testing.assert_allclose(f(np.array([-1.0, 0.5])), [0, np.exp(-0.5)])
+
+
+def test_key_depends_on_arguments_and_modules():
+    s = sp.symbols("s", real=True)
+    expr = t + s
+    lc.cachedLambdify((t, s), expr)
+    lc.cachedLambdify((s, t), expr)
+    lc.cachedLambdify((t, s), expr, modules="math")
+    assert lc.cacheInfo()["misses"] == 3
+
+
+def test_key_depends_on_closure_values():
+    g = sp.Function("g")
+
+    def mapping(k):
+        return {"g": lambda x: k * x}
+
+    f1 = lc.cachedLambdify(t, g(t), modules=["numpy", mapping(1)])
+    f2 = lc.cachedLambdify(t, g(t), modules=["numpy", mapping(2)])
+    assert (f1(3.0), f2(3.0)) == (3.0, 6.0)
+
+
+def test_lru_eviction(monkeypatch):
+    monkeypatch.setattr(lc, "CACHE_SIZE", 2)
+    first = lc.cachedLambdify(t, t + 1)
+    lc.cachedLambdify(t, t + 2)
+    lc.cachedLambdify(t, t + 1)  # volta para o fim da fila
+    lc.cachedLambdify(t, t + 3)  # descarta t + 2
+
+    assert lc.cacheInfo()["size"] == 2
+    assert lc.cachedLambdify(t, t + 1) is first
+    misses = lc.cacheInfo()["misses"]
+    lc.cachedLambdify(t, t + 2)
+    assert lc.cacheInfo()["misses"] == misses + 1
+
+
+def test_disk_round_trip(tmp_path):
+    lc.setPersistDir(str(tmp_path))
+    expr = sp.Piecewise((0, t < 0), (t * sp.exp(-t), True))
+    f = lc.cachedLambdify(t, expr)
+    assert len(list(tmp_path.glob("*.py"))) == 1
+
+    # outro processo: memória vazia, fonte já no disco
+    lc.clearCache()
+    g = lc.cachedLambdify(t, expr)
+    assert lc.cacheInfo()["disk"] == 1
+    assert g is not f
+    grid = np.linspace(-2, 3, 11)
+    np.testing.assert_allclose(g(grid), f(grid))
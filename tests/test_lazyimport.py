@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+import pickle
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import sinais
+import utils
+import utils1
+
+
+def test_package_exports_are_the_real_objects():
+    from sinais import genConvGIF, par
+    from sinais.circuits import par as realPar
+    from sinais.convolution import genConvGIF as realGenConvGIF
+
+    assert par is realPar
+    assert genConvGIF is realGenConvGIF
+    assert pickle.loads(pickle.dumps(par)) is par
+    assert "responseRLCser" in dir(sinais)
+    with pytest.raises(AttributeError):
+        sinais.missing
+
+
+def test_shims_reexport_the_old_imports():
+    import matplotlib.pyplot
+    import numpy
+    import sympy
+
+    assert utils.np is numpy and utils1.np is numpy
+    assert utils.sp is sympy and utils.plt is matplotlib.pyplot
+    assert utils1.lambdify is sympy.lambdify and utils1.apart is sympy.apart
+    from utils import FuncAnimation, Math, display  # noqa: F401
+
+
+def test_imports_stay_light():
+    code = "import sys, sinais, utils, utils1; print('numpy' in sys.modules or 'sympy' in sys.modules)"
+    root = Path(__file__).resolve().parents[1]
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=root)
+    assert out.stdout.strip() == "False"
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+
+from mediacache import MediaCache, formatSize, parseSize
+
+
+def write(path, size):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"x" * size)
+    return path
+
+
+@pytest.fixture
+def media(tmp_path):
+    write(tmp_path / "Tex" / "a.svg", 100)
+    write(tmp_path / "Tex" / "a.tex", 10)
+    write(tmp_path / "Tex" / "orphan.tex", 10)
+    write(tmp_path / "texts" / "b.svg", 100)
+    write(tmp_path / "section_cache" / "c.mp4", 100)
+
+    partials = tmp_path / "videos" / "main" / "480p15" / "partial_movie_files" / "Scene"
+    write(partials / "used.mp4", 100)
+    write(partials / "old.mp4", 100)
+    # lista da última renderização, com caminhos absolutos de outra máquina
+    (partials / "partial_movie_file_list.txt").write_text(
+        "file 'file:C:\\\\media\\\\videos\\\\main\\\\480p15\\\\partial_movie_files\\\\Scene\\\\used.mp4'\n",
+        encoding="utf-8",
+    )
+
+    cache = MediaCache(tmp_path)
+    cache.scan()
+    # do uso mais antigo ao mais recente
+    order = ["videos/main/480p15/partial_movie_files/Scene/used.mp4", "Tex/a.svg", "Tex/a.tex",
+             "texts/b.svg", "videos/main/480p15/partial_movie_files/Scene/old.mp4",
+             "section_cache/c.mp4", "Tex/orphan.tex"]
+    for k, key in enumerate(order):
+        cache.entries[key]["last_used"] = 1000.0 + k
+    return cache
+
+
+def remaining(cache):
+    return {key for key in cache.entries if (cache.media_dir / key).exists()}
+
+
+def test_scan_indexes_every_kind(media):
+    kinds = {key: entry["kind"] for key, entry in media.entries.items()}
+    assert kinds["Tex/a.svg"] == "tex"
+    assert kinds["texts/b.svg"] == "text"
+    assert kinds["section_cache/c.mp4"] == "section"
+    assert media.entries["videos/main/480p15/partial_movie_files/Scene/old.mp4"]["scene"] == "main.Scene"
+    assert media.orphans() == ["Tex/orphan.tex"]
+
+
+def test_evict_order(media):
+    total = media.totalSize()
+
+    # primeiro o .tex órfão, mesmo sendo o mais recente
+    assert media.evict(total - 1) == (1, 10)
+    assert "Tex/orphan.tex" not in media.entries
+
+    # depois o menos usado; o .svg leva o seu .tex junto
+    deleted, freed = media.evict(media.totalSize() - 1)
+    assert (deleted, freed) == (1, 110)
+    assert not {"Tex/a.svg", "Tex/a.tex"} & media.entries.keys()
+
+    # a parcial referenciada pela última renderização é a última a sair
+    media.evict(100)
+    assert remaining(media) == {"videos/main/480p15/partial_movie_files/Scene/used.mp4"}
+    assert media.totalSize() == 100
+
+
+def test_evict_under_the_cap_does_nothing(media):
+    assert media.evict(media.totalSize()) == (0, 0)
+
+
+def test_index_round_trip(media):
+    media.save()
+    again = MediaCache(media.media_dir)
+    assert again.entries == media.entries
+    assert not [name for name in os.listdir(media.media_dir) if name.endswith(".tmp")]
+
+
+def test_sizes():
+    assert parseSize("2G") == 2 * 2**30
+    assert parseSize("1.5M") == int(1.5 * 2**20)
+    assert parseSize("512") == 512
+    assert formatSize(1536) == "1.5K"
+    with pytest.raises(ValueError):
+        parseSize("lots")
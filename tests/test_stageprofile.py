@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+
+from sinais import stageprofile
+from sinais.stageprofile import Profiler, profiling, stage
+
+
+def test_stage_is_a_noop_when_off():
+    assert stage("draw") is stage("lambdify")
+    with stage("draw", frame=1):
+        pass
+
+
+def test_summary_counts_and_self_time():
+    prof = Profiler()
+    # registros: (nome, início, wall, self, cpu, memória, nível, args)
+    prof.records = [
+        ("draw", 0.2, 0.1, 0.1, 0.1, None, 1, {}),
+        ("draw", 0.4, 0.3, 0.3, 0.2, None, 1, {}),
+        ("save", 0.1, 1.0, 0.6, 0.5, None, 0, {}),
+    ]
+    prof.elapsed = 2.0
+    lines = prof.summary().splitlines()
+
+    assert lines[0].split()[:3] == ["stage", "count", "wall"]
+    # ordem de início, não de término
+    assert [line.split()[0] for line in lines[1:]] == ["save", "draw", "total"]
+    save, draw = lines[1].split(), lines[2].split()
+    assert save[1:4] == ["1", "1.000", "0.600"]
+    assert save[4] == "30.0%"
+    assert draw[1:4] == ["2", "0.400", "0.400"]
+    assert draw[-3:] == ["200.00", "300.00", "-"]
+    assert lines[-1].split() == ["total", "2.000"]
+
+
+def test_profiling_records_nested_stages(tmp_path):
+    trace = tmp_path / "trace.json"
+    out = io.StringIO()
+    with profiling(str(trace), memory=True, out=out) as prof:
+        with stage("outer"):
+            with stage("inner", frame=3):
+                bytearray(2**20)
+
+    assert stageprofile._profiler is None
+    names = [record[0] for record in prof.records]
+    assert names == ["inner", "outer"]
+    inner, outer = prof.records
+    assert outer[3] <= outer[2] - inner[2] + 1e-9
+    assert inner[5] >= 2**20
+    assert "inner" in out.getvalue()
+
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    assert [e["name"] for e in events if e["ph"] == "X"] == ["outer", "inner"]
+    assert events[-1]["args"]["frame"] == 3
@@ -0,0 +1,357 @@
+# -*- coding: utf-8 -*-
+"""
+Compile every MathTex/Tex of a scene file ahead of the render
+
+    python texprewarm.py main.py
+
+The TeX strings are collected statically from the source, compiled in a
+single LaTeX run (one page per expression) and the pages are split into
+SVGs by parallel dvisvgm processes, straight into the media/Tex hash
+layout that manim already looks up. Anything that can't be resolved
+statically is just left for manim to compile during the render.
+"""
+import argparse
+import ast
+import os
+import re
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# classe -> (ambiente, separador dos argumentos)
+TEX_CLASSES = {
+    "MathTex": ("align*", " "),
+    "Tex": ("center", ""),
+    "SingleStringMathTex": ("align*", None),
+}
+
+# chamadas que desenham números com um MathTex por caractere
+NUMBER_CALLS = {"add_coordinates", "DecimalNumber", "Integer", "Variable", "include_numbers"}
+NUMBER_CHARS = list("0123456789-.,") + [r"\dots"]
+
+PAGE_ENV = "manimpage"
+
+
+def _stringValues(node, strings):
+    """
+    Possible values of a string argument, [] if not static
+    """
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self":
+        return strings.get(node.attr, [])
+    if isinstance(node, ast.Name):
+        return strings.get(node.id, [])
+    return []
+
+
+def _keysOf(node):
+    """
+    Substrings listed in a set/list/tuple, or the keys of a dict
+    """
+    if isinstance(node, ast.Dict):
+        items = node.keys
+    elif isinstance(node, (ast.Set, ast.List, ast.Tuple)):
+        items = node.elts
+    else:
+        return None
+    if not all(isinstance(k, ast.Constant) and isinstance(k.value, str) for k in items):
+        return None
+    return [k.value for k in items]
+
+
+def collectTex(path):
+    """
+    Statically collect the TeX mobjects built in a Python source file
+
+    Arguments may be string literals, module constants or class attributes
+    (self.x_tex); a class attribute contributes the values assigned to it
+    in every class of the file.
+
+    :param path: scene file [string]
+
+    :return calls: (class name, tex strings, options) of each resolved call [list]
+    :return skipped: line numbers of calls that could not be resolved [list]
+    """
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    # constantes do módulo e atributos de classe com valor string
+    strings = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) \
+                and isinstance(node.value.value, str):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    strings.setdefault(target.id, []).append(node.value.value)
+
+    calls, skipped = [], []
+    numbers = False
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            if isinstance(node, ast.keyword) and node.arg in NUMBER_CALLS:
+                numbers = True
+            continue
+
+        func = node.func
+        name = func.id if isinstance(func, ast.Name) else func.attr if isinstance(func, ast.Attribute) else None
+        if name in NUMBER_CALLS:
+            numbers = True
+        if name not in TEX_CLASSES:
+            continue
+
+        keywords = {k.arg: k.value for k in node.keywords}
+        if "tex_template" in keywords or any(isinstance(a, ast.Starred) for a in node.args) or None in keywords:
+            skipped.append(node.lineno)
+            continue
+
+        values = [_stringValues(a, strings) for a in node.args]
+        if not values or not all(values):
+            skipped.append(node.lineno)
+            continue
+
+        options = {}
+        for key in ("substrings_to_isolate", "tex_to_color_map"):
+            if key in keywords:
+                options[key] = _keysOf(keywords[key])
+        for key in ("arg_separator", "tex_environment"):
+            if key in keywords:
+                value = _stringValues(keywords[key], {})
+                options[key] = value[0] if value else None
+        if any(v is None for v in options.values()):
+            skipped.append(node.lineno)
+            continue
+
+        # um atributo com vários valores possíveis gera uma chamada para cada
+        combos = [[]]
+        for choices in values:
+            combos = [c + [v] for c in combos for v in choices]
+        calls += [(name, tuple(c), options) for c in combos]
+
+    if numbers:
+        calls += [("MathTex", (c,), {}) for c in NUMBER_CHARS]
+
+    return calls, skipped
+
+
+def texExpressions(name, tex_strings, options):
+    """
+    Expressions (and environments) manim compiles for one TeX mobject
+
+    MathTex compiles the joined string and then every isolated substring on
+    its own; the splitting and the special-string fixes are manim's own.
+
+    :param name: "MathTex", "Tex" or "SingleStringMathTex" [string]
+    :param tex_strings: positional arguments of the call [tuple of strings]
+    :param options: substrings_to_isolate, tex_to_color_map, arg_separator, tex_environment [dict]
+
+    :return: (expression, environment) pairs [list]
+    """
+    from manim.mobject.text.tex_mobject import MathTex
+
+    environment, separator = TEX_CLASSES[name]
+    environment = options.get("tex_environment", environment)
+
+    mob = MathTex.__new__(MathTex)
+    mob.organize_left_to_right = False
+    if name == "SingleStringMathTex":
+        strings = [tex_strings[0]]
+    else:
+        separator = options.get("arg_separator", separator)
+        mob.substrings_to_isolate = options.get("substrings_to_isolate") or []
+        mob.tex_to_color_map = dict.fromkeys(options.get("tex_to_color_map") or [])
+        mob.brace_notation_split_occurred = False
+        pieces = mob._break_up_tex_strings(tex_strings)
+        strings = [separator.join(pieces)] + pieces
+
+    return [(mob._get_modified_expression(s), environment) for s in strings]
+
+
+def _splitDocument(code):
+    head, rest = code.split(r"\begin{document}", 1)
+    return head, rest.rsplit(r"\end{document}", 1)[0]
+
+
+def _batchHead(head):
+    """
+    Preamble of the batch document: standalone with one page per PAGE_ENV
+    """
+    match = re.search(r"\\documentclass(\[([^\]]*)\])?\{standalone\}", head)
+    if match is None:
+        return None
+    opts = match.group(2)
+    opts = f"{opts},multi" if opts else "multi"
+    head = head[:match.start()] + r"\documentclass[" + opts + "]{standalone}" + head[match.end():]
+    return head + "\n\\newenvironment{%s}{}{}\n\\standaloneenv{%s}\n" % (PAGE_ENV, PAGE_ENV)
+
+
+def _compileOne(tex_file, template):
+    """
+    Fallback: the usual manim compile of a single .tex
+    """
+    from manim.utils.tex_file_writing import compile_tex, convert_to_svg
+
+    try:
+        dvi = compile_tex(tex_file, template.tex_compiler, template.output_format)
+        convert_to_svg(dvi, template.output_format)
+    except ValueError:
+        return False
+    return True
+
+
+def _convertPages(dvi_file, pages, output_format, out_dir):
+    first, last = pages
+    cmd = [
+        "dvisvgm",
+        *(["--pdf"] if output_format == ".pdf" else []),
+        f"--page={first}-{last}",
+        "--no-fonts",
+        "--verbosity=0",
+        f"--output={out_dir}/%p.svg",
+        str(dvi_file),
+    ]
+    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _compileBatch(tex_files, head, template, tex_dir, workers):
+    """
+    One LaTeX run for all tex_files (same preamble), pages split in parallel
+
+    :return: .tex files whose SVG is still missing [list]
+    """
+    from manim.utils.tex_file_writing import tex_compilation_command
+
+    batch_head = _batchHead(head)
+    if batch_head is None or len(tex_files) == 1:
+        return list(tex_files)
+
+    bodies = [_splitDocument(f.read_text(encoding="utf-8"))[1] for f in tex_files]
+    document = batch_head + "\\begin{document}\n" + "".join(
+        "\\begin{%s}%s\\end{%s}\n" % (PAGE_ENV, body, PAGE_ENV) for body in bodies
+    ) + "\\end{document}\n"
+
+    with tempfile.TemporaryDirectory(dir=tex_dir) as tmp:
+        tmp = Path(tmp)
+        batch = tmp / "batch.tex"
+        batch.write_text(document, encoding="utf-8")
+
+        command = tex_compilation_command(template.tex_compiler, template.output_format, batch, tmp)
+        dvi = batch.with_suffix(template.output_format)
+        if subprocess.run(command, shell=True).returncode != 0 or not dvi.exists():
+            return list(tex_files)
+
+        # cada processo do dvisvgm converte um bloco contíguo de páginas
+        n = len(tex_files)
+        size = -(-n // workers)
+        blocks = [(a + 1, min(a + size, n)) for a in range(0, n, size)]
+        with ThreadPoolExecutor(workers) as pool:
+            list(pool.map(lambda b: _convertPages(dvi, b, template.output_format, tmp), blocks))
+
+        pages = {int(svg.stem): svg for svg in tmp.glob("*.svg") if svg.stem.isdigit()}
+        missing = []
+        for k, tex_file in enumerate(tex_files, 1):
+            if k in pages:
+                os.replace(pages[k], tex_file.with_suffix(".svg"))
+            else:
+                missing.append(tex_file)
+
+    return missing
+
+
+def prewarm(expressions, workers=None, orphans=True):
+    """
+    Make sure media/Tex has the SVG of every expression
+
+    The .tex files are written with manim's own hash names, so the render
+    finds the SVGs and skips LaTeX entirely. Expressions that break the
+    batch run are compiled one by one, in parallel, as manim would.
+
+    :param expressions: (expression, environment) pairs, e.g. from texExpressions [iterable]
+    :param workers: parallel dvisvgm/LaTeX processes (None uses every core) [int]
+    :param orphans: also compile .tex files of the cache that have no SVG [bool]
+
+    :return: number of SVGs compiled and of expressions that failed [tuple]
+    """
+    from manim import config
+    from manim.utils.tex_file_writing import generate_tex_file
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    template = config["tex_template"]
+    tex_dir = config.get_dir("tex_dir")
+    tex_dir.mkdir(parents=True, exist_ok=True)
+
+    pending = {}
+    for expression, environment in expressions:
+        tex_file = generate_tex_file(expression, environment, template)
+        if not tex_file.with_suffix(".svg").exists():
+            pending[tex_file] = None
+    if orphans:
+        for tex_file in tex_dir.glob("*.tex"):
+            if not tex_file.with_suffix(".svg").exists():
+                pending[tex_file] = None
+
+    if not pending:
+        return 0, 0
+
+    # um documento por preâmbulo (arquivos de outros templates ficam separados)
+    groups = {}
+    for tex_file in pending:
+        head = _splitDocument(tex_file.read_text(encoding="utf-8"))[0]
+        groups.setdefault(head, []).append(tex_file)
+
+    missing = []
+    for head, tex_files in groups.items():
+        missing += _compileBatch(tex_files, head, template, tex_dir, workers)
+
+    with ThreadPoolExecutor(workers) as pool:
+        failed = list(pool.map(lambda f: not _compileOne(f, template), missing)).count(True)
+
+    if not config["no_latex_cleanup"]:
+        from manim.utils.tex_file_writing import delete_nonsvg_files
+        delete_nonsvg_files()
+
+    return len(pending) - failed, failed
+
+
+def prewarmFile(path, workers=None, orphans=True):
+    """
+    Collect and prewarm the TeX of a scene file
+
+    :param path: scene file [string]
+    :param workers: parallel processes (None uses every core) [int]
+    :param orphans: also compile .tex files of the cache that have no SVG [bool]
+
+    :return: compiled, failed and statically unresolved calls [tuple]
+    """
+    calls, skipped = collectTex(path)
+    expressions = dict.fromkeys(
+        pair for name, tex_strings, options in calls for pair in texExpressions(name, tex_strings, options)
+    )
+    compiled, failed = prewarm(expressions, workers, orphans)
+    return compiled, failed, skipped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("files", nargs="+", help="scene files (e.g. main.py)")
+    parser.add_argument("--workers", type=int, default=None, help="parallel processes")
+    parser.add_argument("--media_dir", default=None, help="manim media folder")
+    parser.add_argument("--no-orphans", action="store_true", help="ignore .tex without .svg already in the cache")
+    args = parser.parse_args(argv)
+
+    from manim import config
+    if args.media_dir is not None:
+        config.media_dir = args.media_dir
+
+    for path in args.files:
+        compiled, failed, skipped = prewarmFile(path, args.workers, not args.no_orphans)
+        print(f"{path}: {compiled} SVGs compiled, {failed} failed")
+        if skipped:
+            print(f"  not static (left for the render): lines {', '.join(map(str, skipped))}")
+
+
+if __name__ == "__main__":
+    main()